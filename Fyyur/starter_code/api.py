@@ -0,0 +1,241 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import hashlib
+import json
+
+from flask import Blueprint, Response, abort, request
+
+import search
+import scheduling
+from model import db, Venue, Artist
+from facets import parse_filters, filter_criteria
+from queries import (
+    venue_detail, artist_detail, upcoming_shows, decode_cursor, past_cursor,
+    venue_version, artist_version, page_version, upcoming_shows_version,
+    SHOWS_PER_PAGE, MAX_SHOWS_PER_PAGE,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+VENUE_FIELDS = [
+    'id', 'name', 'city', 'state', 'address', 'phone', 'genres', 'image_link',
+    'facebook_link', 'website_link', 'seeking_talent', 'seeking_description',
+    'upcoming_show_count',
+]
+VENUE_DETAIL_FIELDS = [
+    'id', 'name', 'genres', 'address', 'city', 'state', 'phone', 'website',
+    'facebook_link', 'seeking_talent', 'seeking_description', 'image_link',
+    'past_shows', 'upcoming_shows', 'past_shows_count', 'past_shows_count_capped',
+    'upcoming_shows_count', 'past_shows_next',
+]
+ARTIST_FIELDS = [
+    'id', 'name', 'city', 'state', 'phone', 'genres', 'image_link',
+    'facebook_link', 'website_link', 'seeking_venue', 'seeking_description',
+    'upcoming_show_count',
+]
+ARTIST_DETAIL_FIELDS = [
+    'id', 'name', 'genres', 'city', 'state', 'phone', 'website',
+    'facebook_link', 'seeking_venue', 'seeking_description', 'image_link',
+    'past_shows', 'upcoming_shows', 'past_shows_count', 'past_shows_count_capped',
+    'upcoming_shows_count', 'past_shows_next',
+]
+SHOW_FIELDS = [
+    'show_id', 'venue_id', 'venue_name', 'artist_id', 'artist_name',
+    'artist_image_link', 'start_time',
+]
+
+#----------------------------------------------------------------------------#
+#  Helpers
+#----------------------------------------------------------------------------#
+
+def _default(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def dumps(value):
+    # orjson when installed, the stdlib encoder otherwise. Both write
+    # datetimes in ISO 8601.
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def make_etag(*parts):
+    return hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def not_modified(etag):
+    return request.if_none_match.contains(etag)
+
+
+def json_response(data, etag):
+    response = Response(dumps(data), mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
+def not_modified_response(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def requested_fields(allowed):
+    # ?fields=id,name -> ['id', 'name'], all fields when absent.
+    if not request.args.get('fields'):
+        return list(allowed)
+    fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+    unknown = set(fields) - set(allowed)
+    if unknown:
+        abort(400, 'unknown fields: ' + ', '.join(sorted(unknown)))
+    return fields
+
+
+def pick(data, fields):
+    return dict((field, data[field]) for field in fields if field in data)
+
+#----------------------------------------------------------------------------#
+#  Lists
+#----------------------------------------------------------------------------#
+
+def _list(model, allowed):
+    fields = requested_fields(allowed)
+    after = request.args.get('after', 0, type=int)
+    limit = max(1, min(request.args.get('limit', PER_PAGE, type=int), MAX_PER_PAGE))
+    etag = make_etag(page_version(model, after, limit), ','.join(fields), limit)
+    if not_modified(etag):
+        return not_modified_response(etag)
+    columns = [getattr(model, field) for field in fields if field != 'id']
+    rows = (
+        db.session.query(model.id, *columns)
+        .filter(model.id > after)
+        .order_by(model.id)
+        .limit(limit)
+        .all()
+    )
+    return json_response({
+        "data": [pick(row._asdict(), fields) for row in rows],
+        "next": rows[-1].id if len(rows) == limit else None,
+    }, etag)
+
+
+@api.route('/venues')
+def list_venues():
+    return _list(Venue, VENUE_FIELDS)
+
+
+@api.route('/artists')
+def list_artists():
+    return _list(Artist, ARTIST_FIELDS)
+
+
+@api.route('/shows')
+def list_shows():
+    per_page = max(1, min(request.args.get('limit', SHOWS_PER_PAGE, type=int), MAX_SHOWS_PER_PAGE))
+    try:
+        after = decode_cursor(request.args['after']) if 'after' in request.args else None
+    except ValueError:
+        abort(400)
+    etag = make_etag(upcoming_shows_version(per_page, after), per_page)
+    if not_modified(etag):
+        return not_modified_response(etag)
+    page = {"per_page": per_page}
+    data = [pick(tile, SHOW_FIELDS) for tile in upcoming_shows(page, after)]
+    return json_response({"data": data, "next": page['next']}, etag)
+
+@api.route('/shows', methods=['POST'])
+def schedule_shows():
+    # {"shows": [{"venue_id": 1, "artist_id": 2, "start_time": "2030-05-21T21:30"}, ...]}
+    # -> {"data": [<one result per show, see scheduling.schedule()>]}
+    body = request.get_json(silent=True)
+    rows = body.get('shows') if isinstance(body, dict) else None
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        abort(400, 'expected {"shows": [{...}, ...]}')
+    if not rows:
+        abort(400, 'no shows to schedule')
+    if len(rows) > scheduling.MAX_BATCH:
+        abort(400, 'at most %d shows per request' % scheduling.MAX_BATCH)
+    try:
+        results = scheduling.schedule(rows)
+    except Exception:
+        db.session.rollback()
+        raise
+    created = sum(1 for result in results if result['status'] == 'created')
+    response = Response(dumps({"data": results}), mimetype='application/json')
+    response.status_code = 201 if created == len(rows) else 200
+    return response
+
+#----------------------------------------------------------------------------#
+#  Detail
+#----------------------------------------------------------------------------#
+
+def _detail(get_version, build, allowed):
+    # ?past_before=<past_shows_next> pages through the older past shows
+    try:
+        past_before = past_cursor(request.args)
+    except ValueError:
+        abort(400)
+    version = get_version(past_before)
+    if version is None:
+        abort(404)
+    fields = requested_fields(allowed)
+    etag = make_etag(version, ','.join(fields), request.args.get('past_before', ''))
+    if not_modified(etag):
+        return not_modified_response(etag)
+    return json_response(pick(build(past_before), fields), etag)
+
+
+@api.route('/venues/<int:venue_id>')
+def get_venue(venue_id):
+    return _detail(lambda past_before: venue_version(venue_id, past_before),
+                   lambda past_before: venue_detail(venue_id, past_before),
+                   VENUE_DETAIL_FIELDS)
+
+
+@api.route('/artists/<int:artist_id>')
+def get_artist(artist_id):
+    return _detail(lambda past_before: artist_version(artist_id, past_before),
+                   lambda past_before: artist_detail(artist_id, past_before),
+                   ARTIST_DETAIL_FIELDS)
+
+#----------------------------------------------------------------------------#
+#  Search
+#----------------------------------------------------------------------------#
+
+def _search(find, model):
+    # ?q=term, plus facet filters (?genre=Jazz&state=CA) as on the pages
+    fields = requested_fields(['id', 'name', 'num_upcoming_shows'])
+    term = request.args.get('q', '')
+    page = max(1, request.args.get('page', 1, type=int))
+    filters = parse_filters(request.args)
+    results = find(term, page, criteria=filter_criteria(model, filters))
+    # the search has to run either way, a match still skips serialising
+    etag = make_etag(term, page, ','.join(fields), filters, results['count'], [
+        (row['id'], row['version'], row['num_upcoming_shows']) for row in results['data']])
+    if not_modified(etag):
+        return not_modified_response(etag)
+    return json_response({
+        "count": results['count'],
+        "page": page,
+        "data": [pick(row, fields) for row in results['data']],
+    }, etag)
+
+
+@api.route('/venues/search')
+def search_venues():
+    return _search(search.search_venues, Venue)
+
+
+@api.route('/artists/search')
+def search_artists():
+    return _search(search.search_artists, Artist)
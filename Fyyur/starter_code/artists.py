@@ -0,0 +1,214 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from flask import Blueprint, render_template, request, flash, redirect, url_for, abort
+from markupsafe import Markup
+
+from model import db, Artist
+from queries import (
+  artist_directory_query, artist_page, decode_name_cursor, letter_index, artist_detail,
+  related_venue_ids, past_cursor, ARTISTS_PER_PAGE, MAX_ARTISTS_PER_PAGE,
+)
+import search
+from facets import parse_filters, filter_criteria, cached_facet_counts, facet_links
+from cache import cache, venue_key, artist_key, ARTIST_LETTERS
+from typeahead import index as typeahead_index
+import counters
+import tiles
+import jobs
+
+bp = Blueprint('artists', __name__)
+
+#----------------------------------------------------------------------------#
+#  Artist Dalete
+#----------------------------------------------------------------------------#
+
+@bp.route('/artists/<artist_id>', methods=['POST'])
+def delete_artist(artist_id):
+  artist = Artist.query.filter_by(id=artist_id)
+  name = artist.first().name
+  venue_ids = related_venue_ids(artist_id)
+  stale = [artist_key(artist_id)] + [venue_key(id) for id in venue_ids]
+  try:
+    artist.delete()
+    tiles.artist_deleted(artist_id)
+    jobs.after_commit(cache.delete, ARTIST_LETTERS, *stale)
+    jobs.after_commit(typeahead_index.invalidate, 'artists')
+    # the artist's shows went with it (ON DELETE CASCADE)
+    jobs.after_commit(counters.recount, venue_ids=venue_ids, artist_ids=[])
+    db.session.commit()
+    flash('Artist ' + name + ' was successfully deleted!')
+  except:
+    db.session.rollback()
+    flash('An error occurred. Artist ' + name + ' could not be deleted.')
+  finally:
+    db.session.close()
+  return render_template('pages/home.html')
+
+  # BONUS CHALLENGE: Implement a button to delete a Venue on a Venue Page, have it so that
+  # clicking that button delete it from the db then redirect the user to the homepag
+  #Both done, I also created a delete Artist button
+
+#----------------------------------------------------------------------------#
+#  Artist
+#----------------------------------------------------------------------------#
+
+@bp.route('/artists')
+def artists():
+  # TODO: replace with real data returned from querying the database
+  # one page of the alphabetical directory, ?after=<cursor> or ?letter=B
+  per_page = min(request.args.get('per_page', ARTISTS_PER_PAGE, type=int), MAX_ARTISTS_PER_PAGE)
+  per_page = max(per_page, 1)
+  try:
+      after = decode_name_cursor(request.args['after']) if 'after' in request.args else None
+  except ValueError:
+      abort(400)
+  filters = parse_filters(request.args)
+  criteria = filter_criteria(Artist, filters)
+  rows = artist_directory_query(per_page, after, request.args.get('letter'), criteria).all()
+  data, page = artist_page(rows, per_page)
+  # the letter counts are over all artists, filtered pages go without them
+  letters = [] if criteria else cache.get_or_set(ARTIST_LETTERS, letter_index)
+  facets = facet_links(cached_facet_counts(Artist, filters), filters, per_page=per_page)
+  return render_template('pages/artists.html', artists=data, page=page, letters=letters,
+                         filters=filters, facets=facets, facet_endpoint='artists.artists')
+
+#----------------------------------------------------------------------------#
+#  Artist Search
+#----------------------------------------------------------------------------#
+
+@bp.route('/artists/search', methods=['GET', 'POST'])
+def search_artists():
+  # TODO: implement search on artists with partial string search. Ensure it is case-insensitive.
+  # seach for "A" should return "Guns N Petals", "Matt Quevado", and "The Wild Sax Band".
+  # search for "band" should return "The Wild Sax Band".
+  # the facet links come back here with GET, the filters ride along
+  search_term = request.values.get('search_term', '')
+  page = request.values.get('page', 1, type=int)
+  filters = parse_filters(request.values)
+  response = search.search_artists(search_term, page, criteria=filter_criteria(Artist, filters))
+  counts = cached_facet_counts(Artist, filters, [search.match(Artist, search_term)], search_term)
+  facets = facet_links(counts, filters, search_term=search_term)
+  return render_template('pages/search_artists.html', results=response, search_term=search_term,
+                         filters=filters, facets=facets, facet_endpoint='artists.search_artists')
+
+#----------------------------------------------------------------------------#
+#  Artist id show
+#----------------------------------------------------------------------------#
+
+@bp.route('/artists/<int:artist_id>')
+def show_artist(artist_id):
+  # shows the artist page with the given artist_id
+  # TODO: replace with real artist data from the artist table, using artist_id
+  # ?past_before=<cursor> pages through the older past shows. Each page's
+  # rendered body is cached as a part of artist_key(), evicted with it.
+  try:
+    past_before = past_cursor(request.args)
+  except ValueError:
+    abort(400)
+  page = request.args.get('past_before', '')
+  part = cache.get_part(artist_key(artist_id), page)
+  if part is None:
+    data = artist_detail(artist_id, past_before)
+    if data is None:
+      abort(404)
+    part = {"name": data['name'], "body": render_template('pages/show_artist_body.html', artist=data)}
+    cache.set_part(artist_key(artist_id), page, part)
+  return render_template('pages/show_artist.html', artist=part, body=Markup(part['body']))
+
+#----------------------------------------------------------------------------#
+#  Artist Update
+#----------------------------------------------------------------------------#
+
+@bp.route('/artists/<int:artist_id>/edit', methods=['GET'])
+def edit_artist(artist_id):
+  # TODO: populate form with fields from artist with ID <artist_id>
+  from forms import ArtistForm
+  form = ArtistForm()
+  artist = Artist.query.get(artist_id)
+  data={
+    "id": artist_id,
+    "name": artist.name,
+    "genres": artist.genres,
+    "city": artist.city,
+    "state": artist.state,
+    "phone": artist.phone,
+    "website": artist.website_link,
+    "facebook_link": artist.facebook_link,
+    "seeking_venue": artist.seeking_venue,
+    "seeking_description": artist.seeking_description,
+    "image_link": artist.image_link
+    }
+  return render_template('forms/edit_artist.html', form=form, artist=data)
+
+@bp.route('/artists/<int:artist_id>/edit', methods=['POST'])
+def edit_artist_submission(artist_id):
+  # TODO: take values from the form submitted, and update existing
+  # artist record with ID <artist_id> using the new attributes
+  artist = Artist.query.get(artist_id)
+  artist.name = request.form.get('name')
+  artist.genres = request.form.getlist('genres')
+  artist.city = request.form.get('city')
+  artist.state = request.form.get('state')
+  artist.phone = request.form.get('phone')
+  artist.website_link = request.form.get('website')
+  artist.facebook_link = request.form.get('facebook_link')
+  artist.seeking_venue = True if 'seeking_venue' in request.form else False
+  artist.seeking_description = request.form.get('seeking_description')
+  artist.image_link = request.form.get('image_link')
+  tiles.artist_changed(artist_id)
+  jobs.after_commit(evict_related_venues, artist_id)
+  jobs.after_commit(typeahead_index.invalidate, 'artists')
+  db.session.commit()
+  # not left to the job, the redirect below reads it
+  cache.delete(artist_key(artist_id))
+
+  return redirect(url_for('artists.show_artist', artist_id=artist_id))
+
+def evict_related_venues(artist_id):
+  # post-commit job: drops the letter index and the cached pages of the
+  # artist's venues
+  cache.delete(ARTIST_LETTERS, *[venue_key(id) for id in related_venue_ids(artist_id)])
+
+#----------------------------------------------------------------------------#
+#  Create Artist
+#----------------------------------------------------------------------------#
+
+@bp.route('/artists/create', methods=['GET'])
+def create_artist_form():
+  from forms import ArtistForm
+  form = ArtistForm()
+  return render_template('forms/new_artist.html', form=form)
+
+@bp.route('/artists/create', methods=['POST'])
+def create_artist_submission():
+  # called upon submitting the new artist listing form
+  # TODO: insert form data as a new Venue record in the db, instead
+  # TODO: modify data to be the data object returned from db insertion
+  try:
+      artist = Artist(name = request.form.get('name'),
+      city = request.form.get('city'),
+      state = request.form.get('state'),
+      phone = request.form.get('phone'),
+      genres = request.form.getlist('genres'),
+      website_link = request.form.get('website_link'),
+      facebook_link = request.form.get('facebook_link'),
+      seeking_venue = True if 'seeking_venue' in request.form else False,
+      image_link = request.form.get('image_link'),
+      seeking_description = request.form.get('seeking_description'))
+      db.session.add(artist)
+      jobs.after_commit(cache.delete, ARTIST_LETTERS)
+      jobs.after_commit(typeahead_index.invalidate, 'artists')
+      db.session.commit()
+      db.session.close()
+      # on successful db insert, flash success
+      flash('Artist ' + request.form['name'] + ' was successfully listed!')
+  except:
+      db.session.rollback()
+      # TODO: on unsuccessful db insert, flash an error instead.
+      flash('An error occurred. Artist ' + request.form['name'] + ' could not be listed.')
+  finally:
+      db.session.close()
+
+  return render_template('pages/home.html')
@@ -0,0 +1,244 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+# Bundles served by layouts/main.html, files relative to the static folder
+# and concatenated in order. moment.js is left out, no template uses it.
+BUNDLES = {
+    'main.css': [
+        'css/bootstrap.min.css',
+        'css/layout.main.css',
+        'css/main.css',
+        'css/main.responsive.css',
+        'css/main.quickfix.css',
+    ],
+    'head.js': [
+        'js/libs/modernizr-2.8.2.min.js',
+    ],
+    'main.js': [
+        'js/libs/jquery-1.11.1.min.js',
+        'js/libs/bootstrap-3.1.1.min.js',
+        'js/plugins.js',
+        'js/script.js',
+    ],
+}
+
+# Files fingerprinted as they are.
+FILES = [
+    'img/front-splash.jpg',
+    'js/libs/respond-1.4.2.min.js',
+]
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+#----------------------------------------------------------------------------#
+#  Build
+#----------------------------------------------------------------------------#
+
+_source_map = re.compile(r'^\s*//[#@] sourceMappingURL=.*$', re.M)
+_css_comment = re.compile(r'/\*.*?\*/', re.S)
+_css_space = re.compile(r'\s*([{};:,>])\s*')
+_css_url = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+
+
+def minify_css(source):
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    # comments and the whitespace around punctuation, enough for our own
+    # hand-written stylesheets
+    source = _css_comment.sub('', source)
+    source = _css_space.sub(r'\1', source)
+    return ' '.join(source.split())
+
+
+def minify_js(source):
+    source = _source_map.sub('', source)
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    # without rjsmin the scripts are only concatenated, already minified
+    # libraries make up most of the bytes anyway
+    return source
+
+
+def missing_packages():
+    # (package, what the build does without it) for each optional package
+    # that is not installed, see requirements.txt.
+    missing = []
+    if brotli is None:
+        missing.append(('brotli', 'no .br files are written, clients get gzip'))
+    if rcssmin is None:
+        missing.append(('rcssmin', 'stylesheets only lose comments and whitespace'))
+    if rjsmin is None:
+        missing.append(('rjsmin', 'scripts are not minified'))
+    return missing
+
+
+def rebase_css_urls(text, name, locate):
+    # Rewrites the relative url()s of stylesheet `name` (relative to the
+    # static folder) to locate(path), path being the referenced file
+    # relative to the static folder. Query strings and fragments are kept;
+    # absolute URLs and data: URIs are left alone.
+    def rebase(match):
+        quote, url = match.group(1), match.group(2).strip()
+        if url.startswith(('data:', '/', '#')) or '://' in url:
+            return match.group(0)
+        path, suffix = re.match(r'([^?#]*)(.*)', url).groups()
+        path = os.path.normpath(os.path.join(os.path.dirname(name), path)).replace(os.sep, '/')
+        return 'url(%s%s%s%s)' % (quote, locate(path), suffix, quote)
+    return _css_url.sub(rebase, text)
+
+
+def bundle(static_folder, files, locate=None):
+    # `locate` as in rebase_css_urls(), without it url()s are kept as they are
+    sources = []
+    for name in files:
+        with open(os.path.join(static_folder, name), encoding='utf-8') as source:
+            text = source.read()
+        if locate is not None and name.endswith('.css'):
+            text = rebase_css_urls(text, name, locate)
+        if name.endswith('.min.css') or name.endswith('.min.js'):
+            text = _source_map.sub('', text)
+        elif name.endswith('.css'):
+            text = minify_css(text)
+        else:
+            text = minify_js(text)
+        sources.append(text.strip())
+    # `;` keeps a script without a trailing semicolon from running into the
+    # next one
+    separator = '\n' if files[0].endswith('.css') else ';\n'
+    return separator.join(sources).encode('utf-8')
+
+
+def hashed_name(name, content):
+    root, ext = os.path.splitext(name)
+    return '%s.%s%s' % (root, hashlib.sha256(content).hexdigest()[:12], ext)
+
+
+def write_asset(out_dir, name, content):
+    path = os.path.join(out_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as out:
+        out.write(content)
+    if name.endswith(COMPRESSIBLE):
+        # mtime=0 keeps the .gz identical between builds of the same content
+        with open(path + '.gz', 'wb') as out:
+            out.write(gzip.compress(content, 9, mtime=0))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as out:
+                out.write(brotli.compress(content, quality=11))
+
+
+def build(static_folder, out_dir, static_url='/static'):
+    # Writes the bundles and files under content-hashed names, with .gz and
+    # .br (when the brotli package is installed) next to the text ones, and
+    # manifest.json mapping their plain names to the hashed ones. Bundles
+    # go to the top of out_dir, so the files their stylesheets reference
+    # (fonts, images) are fingerprinted too and the url()s rewritten to the
+    # copies. A referenced file missing from the static folder is pointed
+    # at static_url, where the plain stylesheet would have looked for it.
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    manifest = {}
+
+    def add_file(name):
+        with open(os.path.join(static_folder, name), 'rb') as source:
+            content = source.read()
+        manifest[name] = hashed_name(name, content)
+        write_asset(out_dir, manifest[name], content)
+        return manifest[name]
+
+    def locate(name):
+        if name in manifest:
+            return manifest[name]
+        if not os.path.isfile(os.path.join(static_folder, name)):
+            return '%s/%s' % (static_url, name)
+        return add_file(name)
+
+    for name, files in BUNDLES.items():
+        content = bundle(static_folder, files, locate)
+        manifest[name] = hashed_name(name, content)
+        write_asset(out_dir, manifest[name], content)
+    for name in FILES:
+        add_file(name)
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as out:
+        json.dump(manifest, out, indent=2, sort_keys=True)
+    return manifest
+
+#----------------------------------------------------------------------------#
+#  Serving
+#----------------------------------------------------------------------------#
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, 'manifest.json')) as manifest:
+            return json.load(manifest)
+    except (IOError, ValueError):
+        return {}
+
+
+def init_assets(app):
+    # Template helpers, both take the same extra arguments as url_for():
+    #   asset_url('img/front-splash.jpg')  one file
+    #   bundle_urls('main.css')            the bundle, as a list of URLs
+    # Built assets are served from /assets with a one year immutable
+    # Cache-Control, precompressed when the client accepts it. Before
+    # `flask build-assets` has run (e.g. in development) they fall back to
+    # the plain static files, a bundle to each of its files.
+    out_dir = app.config['ASSETS_FOLDER']
+    manifest = load_manifest(out_dir)
+    app.extensions['assets'] = manifest
+
+    def asset_url(filename, **values):
+        if filename in manifest:
+            return url_for('asset', filename=manifest[filename], **values)
+        return url_for('static', filename=filename, **values)
+
+    def bundle_urls(name, **values):
+        if name in manifest:
+            return [url_for('asset', filename=manifest[name], **values)]
+        return [url_for('static', filename=filename, **values) for filename in BUNDLES[name]]
+
+    def asset(filename):
+        mimetype = mimetypes.guess_type(filename)[0]
+        accepted = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[encoding] and os.path.isfile(os.path.join(out_dir, filename + suffix)):
+                response = send_from_directory(out_dir, filename + suffix, mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_from_directory(out_dir, filename, mimetype=mimetype)
+        if filename.endswith(COMPRESSIBLE):
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+    app.add_url_rule('/assets/<path:filename>', 'asset', asset)
+    app.jinja_env.globals.update(asset_url=asset_url, bundle_urls=bundle_urls)
@@ -0,0 +1,181 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import asyncio
+
+from flask import abort, current_app, render_template, request
+from markupsafe import Markup
+from sqlalchemy import select
+from sqlalchemy.pool import NullPool
+
+from model import Venue, Artist
+from queries import (
+    venue_areas_query, group_areas, venue_data, artist_data, decode_cursor,
+    encode_cursor, show_tile, upcoming_tiles_query, venue_tiles_queries, artist_tiles_queries,
+    page_shows, past_cursor,
+    SHOWS_PER_PAGE, MAX_SHOWS_PER_PAGE, artist_directory_query, artist_page,
+    decode_name_cursor, letter_index, ARTISTS_PER_PAGE, MAX_ARTISTS_PER_PAGE,
+)
+from cache import venue_key, artist_key, ARTIST_LETTERS
+from facets import parse_filters, filter_criteria, cached_facet_counts, facet_links
+
+#----------------------------------------------------------------------------#
+#  Async engine
+#----------------------------------------------------------------------------#
+
+# Flask runs every async view in its own event loop and asyncpg connections
+# can not move between loops, so the async engine keeps no pool of its own
+# (NullPool). Put PgBouncer in front of Postgres to make connecting cheap.
+# Each app has its own, created by init_async_reads().
+
+def make_engine(url):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    return create_async_engine(url, poolclass=NullPool)
+
+
+def engine():
+    return current_app.extensions['async_engine']
+
+
+async def fetch_all(statement):
+    async with engine().connect() as conn:
+        return (await conn.execute(statement)).all()
+
+
+async def fetch_one(statement):
+    async with engine().connect() as conn:
+        return (await conn.execute(statement)).first()
+
+#----------------------------------------------------------------------------#
+#  Views
+#----------------------------------------------------------------------------#
+
+# Same templates and page data as the sync views in the blueprints. Queries
+# a page needs that do not depend on each other run concurrently, each on
+# its own connection.
+
+async def venues():
+    # facet counts come from the cache, or a sync query on a miss
+    filters = parse_filters(request.args)
+    rows = await fetch_all(venue_areas_query(filter_criteria(Venue, filters)).statement)
+    facets = facet_links(cached_facet_counts(Venue, filters), filters)
+    return render_template('pages/venues.html', areas=group_areas(rows), facets=facets,
+                           facet_endpoint='venues.venues')
+
+
+def artists_view(cache):
+    # The letter index and facet counts are shared with the sync view
+    # through the cache and built with sync queries on a miss.
+
+    async def artists():
+        per_page = max(1, min(request.args.get('per_page', ARTISTS_PER_PAGE, type=int), MAX_ARTISTS_PER_PAGE))
+        try:
+            after = decode_name_cursor(request.args['after']) if 'after' in request.args else None
+        except ValueError:
+            abort(400)
+        filters = parse_filters(request.args)
+        criteria = filter_criteria(Artist, filters)
+        statement = artist_directory_query(per_page, after, request.args.get('letter'), criteria).statement
+        rows = await fetch_all(statement)
+        data, page = artist_page(rows, per_page)
+        letters = [] if criteria else cache.get_or_set(ARTIST_LETTERS, letter_index)
+        facets = facet_links(cached_facet_counts(Artist, filters), filters, per_page=per_page)
+        return render_template('pages/artists.html', artists=data, page=page, letters=letters,
+                               filters=filters, facets=facets, facet_endpoint='artists.artists')
+
+    return artists
+
+
+async def shows():
+    per_page = max(1, min(request.args.get('per_page', SHOWS_PER_PAGE, type=int), MAX_SHOWS_PER_PAGE))
+    try:
+        after = decode_cursor(request.args['after']) if 'after' in request.args else None
+    except ValueError:
+        abort(400)
+    statement = upcoming_tiles_query(after).limit(per_page + 1).statement
+    rows = await fetch_all(statement)
+    page = {"per_page": per_page, "next": None}
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        page['next'] = encode_cursor(rows[-1])
+    return render_template('pages/shows.html', shows=[show_tile(row) for row in rows], page=page)
+
+
+async def load_shows(queries):
+    upcoming, past, past_count = await asyncio.gather(
+        *[fetch_all(query.statement) for query in queries])
+    return page_shows(upcoming, past, past_count[0][0])
+
+
+async def load_venue(venue_id, past_before=None):
+    venue, shows = await asyncio.gather(
+        fetch_one(select(Venue.__table__).where(Venue.id == venue_id)),
+        load_shows(venue_tiles_queries(venue_id, past_before)),
+    )
+    if venue is None:
+        return None
+    return venue_data(venue, shows)
+
+
+async def load_artist(artist_id, past_before=None):
+    artist, shows = await asyncio.gather(
+        fetch_one(select(Artist.__table__).where(Artist.id == artist_id)),
+        load_shows(artist_tiles_queries(artist_id, past_before)),
+    )
+    if artist is None:
+        return None
+    return artist_data(artist, shows)
+
+
+def _past_cursor():
+    try:
+        return past_cursor(request.args)
+    except ValueError:
+        abort(400)
+
+
+def detail_views(cache):
+    # The detail views read through the same cache as the sync ones, a
+    # rendered body per ?past_before= page as a part of the detail key.
+
+    async def show_venue(venue_id):
+        past_before = _past_cursor()
+        page = request.args.get('past_before', '')
+        part = cache.get_part(venue_key(venue_id), page)
+        if part is None:
+            data = await load_venue(venue_id, past_before)
+            if data is None:
+                abort(404)
+            part = {"name": data['name'], "body": render_template('pages/show_venue_body.html', venue=data)}
+            cache.set_part(venue_key(venue_id), page, part)
+        return render_template('pages/show_venue.html', venue=part, body=Markup(part['body']))
+
+    async def show_artist(artist_id):
+        past_before = _past_cursor()
+        page = request.args.get('past_before', '')
+        part = cache.get_part(artist_key(artist_id), page)
+        if part is None:
+            data = await load_artist(artist_id, past_before)
+            if data is None:
+                abort(404)
+            part = {"name": data['name'], "body": render_template('pages/show_artist_body.html', artist=data)}
+            cache.set_part(artist_key(artist_id), page, part)
+        return render_template('pages/show_artist.html', artist=part, body=Markup(part['body']))
+
+    return show_venue, show_artist
+
+
+def init_async_reads(app, cache):
+    # Swaps the read-only views for their async versions. Routes, endpoints
+    # and url_for() stay the same. Needs SQLAlchemy >= 1.4, asyncpg and
+    # Flask's async extra (pip install "flask[async]").
+    app.extensions['async_engine'] = make_engine(app.config['ASYNC_DATABASE_URI'])
+    show_venue, show_artist = detail_views(cache)
+    app.view_functions.update({
+        'venues.venues': venues,
+        'artists.artists': artists_view(cache),
+        'shows.shows': shows,
+        'venues.show_venue': show_venue,
+        'artists.show_artist': show_artist,
+    })
@@ -0,0 +1,57 @@
+"""Micro-benchmark of the Jinja `datetime` filter.
+
+Formats the start times of N synthetic shows (10k by default) with the old
+filter (dateutil parse of str(start_time) + babel pattern parsing on every
+call) and with filters.format_datetime, and prints the per-call cost.
+
+    python -m benchmarks.datetime_filter --shows 10000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import babel.dates
+import dateutil.parser
+
+from filters import format_datetime
+
+
+def old_format_datetime(value, format='medium'):
+    date = dateutil.parser.parse(value)
+    if format == 'full':
+        format = "EEEE MMMM, d, y 'at' h:mma"
+    elif format == 'medium':
+        format = "EE MM, dd, y h:mma"
+    return babel.dates.format_datetime(date, format, locale='en')
+
+
+def timed(function, values):
+    start = time.perf_counter()
+    for value in values:
+        function(value, 'full')
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shows', type=int, default=10000)
+    args = parser.parse_args()
+
+    # shows start on the hour or half hour, so many tiles share a start time
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    starts = [now + timedelta(minutes=30 * random.randint(0, 24 * 60)) for _ in range(args.shows)]
+
+    old = timed(old_format_datetime, [str(start) for start in starts])
+    format_datetime.cache_clear()
+    cold = timed(format_datetime, starts)
+    warm = timed(format_datetime, starts)
+
+    print('%d shows' % args.shows)
+    print('old filter            %8.2f us/call' % old)
+    print('new filter, cold LRU  %8.2f us/call' % cold)
+    print('new filter, warm LRU  %8.2f us/call' % warm)
+
+
+if __name__ == '__main__':
+    main()
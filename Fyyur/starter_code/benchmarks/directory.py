@@ -0,0 +1,91 @@
+"""Artist directory benchmark: whole-roster listing vs keyset pages.
+
+Renders pages/artists.html with every artist, the way /artists used to,
+then requests /artists pages through the Flask test client: the first
+page, a page deep into the alphabet (by cursor), a letter jump, and the
+letter index with a cold and a warm cache. Prints wall time and peak
+Python memory (tracemalloc) of each. ``--seed`` fills a scratch database
+with --artists artists first (1M by default) and a few venues and shows.
+
+    python -m benchmarks.directory --seed --artists 1000000
+"""
+import argparse
+import time
+import tracemalloc
+
+from flask import render_template
+
+from app import create_app
+from model import db, Artist
+from queries import row_version, letter_index, encode_name_cursor
+from cache import ARTIST_LETTERS
+from benchmarks.seed import seed
+
+
+def whole_roster():
+    # the former /artists: every artist in one query and one page
+    rows = db.session.query(Artist.id, Artist.name, row_version(Artist).label('stamp'))
+    data = [{"id": row.id, "name": row.name, "stamp": row.stamp} for row in rows]
+    return render_template('pages/artists.html', artists=data, page={"next": None}, letters=[])
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = len(run())
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--artists', type=int, default=1000000)
+    parser.add_argument('--seed', action='store_true')
+    parser.add_argument('--skip-roster', action='store_true', help='leave out the whole-roster render')
+    args = parser.parse_args()
+
+    app = create_app(DEBUG=False, FRAGMENT_CACHE_SIZE=0)
+    cache = app.extensions['cache']
+    client = app.test_client()
+
+    def get(url):
+        return lambda: client.get(url).get_data()
+
+    with app.app_context():
+        if args.seed:
+            seed(venues=100, artists=args.artists, shows=1000, reset=True, random_seed=0.42)
+        total = db.session.query(Artist).count()
+        # the cursor of the artist 90% of the way through the directory
+        deep = (db.session.query(Artist.id, Artist.name)
+                .order_by(Artist.name, Artist.id)
+                .offset(int(total * 0.9)).limit(1).first())
+        db.session.remove()
+    if deep is None:
+        raise SystemExit('no artists found, run with --seed against a scratch database')
+
+    runs = [
+        ('first page, cold index', lambda: cache.delete(ARTIST_LETTERS) or get('/artists')()),
+        ('first page', get('/artists')),
+        ('page at 90%', lambda: client.get('/artists', query_string={'after': encode_name_cursor(deep)}).get_data()),
+        ('letter jump (L)', get('/artists?letter=L')),
+    ]
+    if not args.skip_roster:
+        def roster():
+            with app.test_request_context('/artists'):
+                return whole_roster()
+        runs.insert(0, ('whole roster', roster))
+
+    print('%d artists' % total)
+    for name, run in runs:
+        seconds, peak, size = measure(run)
+        print('%-24s %9.1f ms  peak %8.1f MB  %10d bytes of HTML' % (
+            name, seconds * 1000, peak / 1024.0 / 1024, size))
+    with app.app_context():
+        seconds, peak, size = measure(letter_index)
+    print('%-24s %9.1f ms  (the grouped query the cache saves)' % ('letter_index()', seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""EXPLAIN harness: checks that the hot routes read `show` through indexes.
+
+Requests every read route with the Flask test client, records the SQL it
+issues and runs EXPLAIN on each statement touching the show table. Any
+sequential scan on `show` or one of its monthly partitions is reported and
+the script exits non-zero.
+Run it against a database seeded with ``benchmarks.seed``.
+
+    python -m benchmarks.explain
+"""
+import json
+import re
+import sys
+
+from sqlalchemy import event
+
+from app import app
+from model import db, Show
+
+# show and its monthly partitions, show_default is left out: it is meant
+# to stay (nearly) empty and Postgres rightly scans it sequentially
+SHOW_TABLES = re.compile(r'^show(_\d{4}_\d{2})?$')
+
+ROUTES = [
+    ('GET', '/venues', None),
+    ('GET', '/shows', None),
+    ('GET', '/venues/{venue_id}', None),
+    ('GET', '/artists/{artist_id}', None),
+    ('POST', '/venues/search', {'search_term': 'Venue 1'}),
+    ('POST', '/artists/search', {'search_term': 'The'}),
+]
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        for sub in plan_nodes(child):
+            yield sub
+
+
+def capture(client, method, url, data):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        client.open(url, method=method, data=data)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+
+def seq_scans(statement, parameters):
+    with db.engine.connect() as conn:
+        cursor = conn.connection.cursor()
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + statement, parameters)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return [node for node in plan_nodes(plan[0]['Plan'])
+            if node['Node Type'] == 'Seq Scan' and SHOW_TABLES.match(node.get('Relation Name', ''))]
+
+
+def main():
+    failures = 0
+    with app.app_context():
+        show = Show.query.order_by(Show.start_time.desc()).first()
+        if show is None:
+            sys.exit('no shows found, seed the database first (python -m benchmarks.seed)')
+        ids = {'venue_id': show.venue_id, 'artist_id': show.artist_id}
+        client = app.test_client()
+        for method, url, data in ROUTES:
+            url = url.format(**ids)
+            for statement, parameters in capture(client, method, url, data):
+                if ' show' not in statement:
+                    continue
+                if seq_scans(statement, parameters):
+                    failures += 1
+                    print('SEQ SCAN  %s %s\n  %s' % (method, url, ' '.join(statement.split())))
+            print('checked   %s %s' % (method, url))
+    if failures:
+        sys.exit('%d statement(s) scan the show table sequentially' % failures)
+
+
+if __name__ == '__main__':
+    main()
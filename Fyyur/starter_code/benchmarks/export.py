@@ -0,0 +1,54 @@
+"""Export memory benchmark: peak RSS while dumping the show table.
+
+Optionally seeds the database first (``--seed-shows 5000000``), then exports
+shows through the streaming exporter and reports rows/s and the peak RSS
+growth of the process. ``--orm`` runs the old ``Show.query.all()`` approach
+for comparison.
+
+    python -m benchmarks.export --seed-shows 5000000 --format parquet
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from app import app
+from model import Show
+from benchmarks.seed import seed
+from exporter import export
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024 if sys.platform == 'darwin' else 1024.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed-shows', type=int, default=0)
+    parser.add_argument('--format', default='ndjson', choices=['ndjson', 'parquet'])
+    parser.add_argument('--orm', action='store_true', help='load everything with Show.query.all()')
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.seed_shows:
+            seed(venues=10000, artists=50000, shows=args.seed_shows)
+        before = peak_rss_mb()
+        path = os.path.join(tempfile.mkdtemp(), 'shows.' + args.format)
+        if args.orm:
+            start = time.perf_counter()
+            rows = len(Show.query.all())
+            report = {'rows': rows, 'seconds': round(time.perf_counter() - start, 2)}
+        else:
+            report = export('shows', path, args.format)
+        after = peak_rss_mb()
+
+    print('%s: %d rows in %ss' % ('orm .all()' if args.orm else args.format, report['rows'], report['seconds']))
+    print('peak RSS %.1f MB (+%.1f MB during export)' % (after, after - before))
+
+
+if __name__ == '__main__':
+    main()
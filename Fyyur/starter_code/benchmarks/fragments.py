@@ -0,0 +1,70 @@
+"""Render-time benchmark of the {% cache %} fragment tags.
+
+Renders pages/shows.html with N synthetic show tiles (5,000 by default)
+without a fragment cache, with a cold one and with a warm one, and prints
+the mean render time of each. No database is needed.
+
+    python -m benchmarks.fragments --tiles 5000 --runs 20
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from flask import render_template
+
+from app import app
+from fragments import FragmentCache
+
+
+def tiles(count):
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    return [{
+        "show_id": i,
+        "venue_id": random.randint(1, 500),
+        "venue_name": 'Venue %d' % i,
+        "artist_id": random.randint(1, 2000),
+        "artist_name": 'Artist %d' % i,
+        "artist_image_link": 'https://images.example.com/artist/%d.jpg' % i,
+        "start_time": now + timedelta(minutes=30 * random.randint(0, 24 * 60)),
+        "stamp": '%d.%d.%d' % (i, i, i),
+    } for i in range(count)]
+
+
+def render(shows):
+    start = time.perf_counter()
+    render_template('pages/shows.html', shows=shows, page={"per_page": len(shows), "next": None})
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tiles', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    shows = tiles(args.tiles)
+    budget = 64 * 1024 * 1024
+    with app.test_request_context('/shows'):
+        app.jinja_env.fragment_cache = None
+        render(shows)
+        uncached = sum(render(shows) for _ in range(args.runs)) / args.runs
+
+        cold = 0.0
+        for _ in range(args.runs):
+            app.jinja_env.fragment_cache = FragmentCache(budget)
+            cold += render(shows)
+        cold /= args.runs
+
+        warm = sum(render(shows) for _ in range(args.runs)) / args.runs
+        stats = app.jinja_env.fragment_cache.stats()
+
+    print('%d tiles, %d runs, %d fragments, %.1f MB cached' % (
+        args.tiles, args.runs, stats['entries'], stats['size'] / 1024.0 / 1024))
+    print('no fragment cache  %8.1f ms/render' % uncached)
+    print('cold cache         %8.1f ms/render' % cold)
+    print('warm cache         %8.1f ms/render' % warm)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Load test for the read-only pages.
+
+Hits the listing and detail pages of one or more running servers with a
+fixed number of concurrent clients and prints req/s and latency percentiles
+per server. To compare the sync and async read paths, start the app twice:
+
+    gunicorn -w 4 -b :5000 app:app
+    ASYNC_READS=1 gunicorn -w 4 -b :5001 app:app
+    python -m benchmarks.load http://localhost:5000 http://localhost:5001
+
+The venue and artist ids used for the detail pages are picked at random
+between 1 and --max-id.
+"""
+import argparse
+import random
+import threading
+import time
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+PATHS = [
+    '/venues',
+    '/artists',
+    '/shows',
+    '/venues/{id}',
+    '/artists/{id}',
+]
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+def client(base_url, paths, max_id, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        url = base_url + random.choice(paths).format(id=random.randint(1, max_id))
+        start = time.perf_counter()
+        try:
+            with urlopen(url, timeout=30) as response:
+                response.read()
+        except (HTTPError, URLError, OSError):
+            errors.append(url)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run(base_url, paths, concurrency, duration, max_id):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client, args=(base_url, paths, max_id, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / float(duration),
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('servers', nargs='+', help='base URLs, e.g. http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--max-id', type=int, default=1000)
+    parser.add_argument('--path', action='append', dest='paths', help='override the page list')
+    args = parser.parse_args()
+
+    for server in args.servers:
+        result = run(server.rstrip('/'), args.paths or PATHS, args.concurrency, args.duration, args.max_id)
+        print('%-28s %8.1f req/s  p50 %7.1f ms  p99 %7.1f ms  (%d requests, %d errors)' % (
+            server, result['rps'], result['p50'], result['p99'], result['requests'], result['errors']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Locust load profile for the public pages.
+
+Simulated visitors browse the listings, open venue and artist pages and
+search, weighted roughly like real traffic. Needs locust (``pip install
+locust``), which is not in requirements.txt. For a quick run without it see
+``benchmarks.load``.
+
+    gunicorn -w 4 -b :5000 app:app
+    locust -f benchmarks/locustfile.py --host http://localhost:5000 \\
+        --headless -u 100 -r 10 -t 2m
+
+Venue and artist ids are picked at random between 1 and FYYUR_MAX_ID
+(1000 by default), the ids ``benchmarks.seed`` generates.
+"""
+import os
+import random
+
+from locust import HttpUser, between, task
+
+MAX_ID = int(os.environ.get('FYYUR_MAX_ID', 1000))
+SEARCH_TERMS = ['Venue 1', 'The', 'Jazz', 'San Francisco', 'DJ']
+
+
+class Visitor(HttpUser):
+    wait_time = between(1, 5)
+
+    @task(10)
+    def show_venue(self):
+        self.client.get('/venues/%d' % random.randint(1, MAX_ID), name='/venues/[id]')
+
+    @task(10)
+    def show_artist(self):
+        self.client.get('/artists/%d' % random.randint(1, MAX_ID), name='/artists/[id]')
+
+    @task(5)
+    def shows(self):
+        self.client.get('/shows')
+
+    @task(4)
+    def venues(self):
+        self.client.get('/venues')
+
+    @task(4)
+    def artists(self):
+        self.client.get('/artists')
+
+    @task(3)
+    def search(self):
+        kind = random.choice(['venues', 'artists'])
+        self.client.post('/%s/search' % kind, data={'search_term': random.choice(SEARCH_TERMS)},
+                         name='/%s/search' % kind)
+
+    @task(2)
+    def index(self):
+        self.client.get('/')
@@ -0,0 +1,123 @@
+"""Show partitioning benchmark: upcoming-show queries, partitioned vs flat.
+
+Copies the partitioned ``show`` table into an unpartitioned ``show_flat``
+with the indexes ``show`` had before it was partitioned, then runs the
+queries that only care about upcoming shows against both and prints their
+p50 times and how many partitions each plan reads. ``--seed`` first fills
+a scratch database with --shows shows (10M by default) spread over
+--past-days of history and the coming year, the shape of a site that has
+been running for a while.
+
+    python -m benchmarks.partitions --seed --shows 10000000 --past-days 1825
+
+``--archive N`` then runs the archival job with N months of retention and
+measures again.
+"""
+import argparse
+import statistics
+import time
+from datetime import date, datetime
+
+from app import create_app
+from model import db
+import partitions
+from benchmarks.seed import seed
+
+FLAT = """
+DROP TABLE IF EXISTS show_flat;
+CREATE TABLE show_flat AS SELECT * FROM show;
+CREATE INDEX ON show_flat (venue, start_time);
+CREATE INDEX ON show_flat (artist, start_time);
+CREATE INDEX ON show_flat (start_time);
+ANALYZE show_flat;
+"""
+
+QUERIES = [
+    ('next 30 shows',
+     'SELECT id, start_time, venue, artist FROM {table} WHERE start_time >= :now '
+     'ORDER BY start_time, id LIMIT 30'),
+    ("a venue's upcoming shows",
+     'SELECT id, start_time, artist FROM {table} WHERE venue = :venue AND start_time >= :now '
+     'ORDER BY start_time'),
+    ('upcoming count per venue',
+     'SELECT venue, count(*) FROM {table} WHERE start_time >= :now GROUP BY venue'),
+    ('upcoming count',
+     'SELECT count(*) FROM {table} WHERE start_time >= :now'),
+]
+
+
+def timed(sql, params, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        db.session.execute(db.text(sql), params).fetchall()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def tables_read(sql, params):
+    # the show tables (partitions) the plan reads
+    plan = db.session.execute(db.text('EXPLAIN (FORMAT JSON) ' + sql), params).scalar()
+    found = set()
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Relation Name', '').startswith('show'):
+            found.add(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return len(found)
+
+
+def size(table):
+    return db.session.execute(
+        db.text('SELECT pg_total_relation_size(:table) / 1048576.0'), {'table': table}).scalar()
+
+
+def measure(runs):
+    params = {'now': datetime.now(), 'venue': 1}
+    print('%-26s %14s %14s' % ('', 'flat', 'partitioned'))
+    for name, sql in QUERIES:
+        results = []
+        for table in ('show_flat', 'show'):
+            query = sql.format(table=table)
+            results.append((timed(query, params, runs), tables_read(query, params)))
+        print('%-26s %8.1f ms (%d) %8.1f ms (%d)' % (
+            name, results[0][0], results[0][1], results[1][0], results[1][1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', action='store_true')
+    parser.add_argument('--shows', type=int, default=10000000)
+    parser.add_argument('--past-days', type=int, default=1825)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--archive', type=int, metavar='MONTHS', help='archive past this many months, then rerun')
+    args = parser.parse_args()
+
+    app = create_app(DEBUG=False, DB_STATEMENT_TIMEOUT=0)
+    with app.app_context():
+        if args.seed:
+            seed(venues=10000, artists=50000, shows=args.shows, reset=True, random_seed=0.42,
+                 past_days=args.past_days)
+        count = db.session.execute(db.text('SELECT count(*) FROM show')).scalar()
+        if not count:
+            raise SystemExit('no shows found, run with --seed against a scratch database')
+        db.session.execute(db.text(FLAT))
+        db.session.commit()
+        print('%d shows, %d monthly partitions, %.0f MB flat' % (
+            count, len(partitions.monthly_partitions()), size('show_flat')))
+        measure(args.runs)
+        if args.archive is not None:
+            today = date.today()
+            archived = partitions.archive_partitions(partitions.add_months(today, -args.archive))
+            db.session.execute(db.text('ANALYZE show'))
+            db.session.commit()
+            print('\narchived %d partitions, %d shows left in show' % (
+                len(archived), db.session.execute(db.text('SELECT count(*) FROM show')).scalar()))
+            measure(args.runs)
+        db.session.execute(db.text('DROP TABLE show_flat'))
+        db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
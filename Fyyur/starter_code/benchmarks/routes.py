@@ -0,0 +1,179 @@
+"""Per-route micro-benchmarks: latency and SQL statements per request.
+
+Requests every public page and API listing through the Flask test client
+and prints p50/p95 latency and the statements each request issues. The
+detail page and fragment caches are switched off unless ``--cached`` is
+given, so every request measures the database path. ``--seed`` fills a
+scratch database with ``benchmarks.seed`` first, with a fixed random seed
+so the same sizes always give the same rows.
+
+    python -m benchmarks.routes --seed --save benchmarks/baseline.json
+    python -m benchmarks.routes --compare benchmarks/baseline.json
+
+``--compare`` exits non-zero when a route issues more statements than in
+the baseline, or its p50 is over the baseline by more than --tolerance
+(and by at least --slack ms, so sub-millisecond noise is ignored). This is
+what ``fab test`` runs. Timings depend on the machine, save a baseline on
+the one you compare on.
+"""
+import argparse
+import json
+import sys
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import create_app
+from model import db, Venue, Artist
+from benchmarks.seed import seed
+
+DATASET = {'venues': 200, 'artists': 1000, 'shows': 10000}
+RANDOM_SEED = 0.42
+
+ROUTES = [
+    ('index', 'GET', '/', None),
+    ('venues', 'GET', '/venues', None),
+    ('venues_faceted', 'GET', '/venues?genre=Jazz&state=CA', None),
+    ('artists', 'GET', '/artists', None),
+    ('shows', 'GET', '/shows', None),
+    ('show_venue', 'GET', '/venues/{venue_id}', None),
+    ('show_artist', 'GET', '/artists/{artist_id}', None),
+    ('search_venues', 'POST', '/venues/search', {'search_term': 'Venue 1'}),
+    ('search_artists', 'POST', '/artists/search', {'search_term': 'The'}),
+    ('api_venues', 'GET', '/api/v1/venues', None),
+    ('api_shows', 'GET', '/api/v1/shows', None),
+]
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+def fetch(client, method, url, data):
+    # reads the whole body, streamed pages render while it is read
+    response = client.open(url, method=method, data=data)
+    response.get_data()
+    response.close()
+    return response
+
+
+def measure(client, method, url, data, requests, warmup):
+    # (p50 ms, p95 ms, statements per request, status) over `requests` runs
+    statements = [0]
+
+    def before_cursor_execute(*args):
+        statements[0] += 1
+
+    for _ in range(warmup):
+        fetch(client, method, url, data)
+    latencies = []
+    counts = set()
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        for _ in range(requests):
+            statements[0] = 0
+            start = time.perf_counter()
+            response = fetch(client, method, url, data)
+            latencies.append((time.perf_counter() - start) * 1000)
+            counts.add(statements[0])
+    finally:
+        event.remove(Engine, 'before_cursor_execute', before_cursor_execute)
+    return {
+        'p50': round(percentile(latencies, 50), 2),
+        'p95': round(percentile(latencies, 95), 2),
+        'queries': max(counts),
+        'status': response.status_code,
+    }
+
+
+def compare(results, baseline, tolerance, slack):
+    regressions = []
+    for name, result in results.items():
+        before = baseline['routes'].get(name)
+        if before is None:
+            continue
+        if result['status'] != before['status']:
+            regressions.append('%s: responded %d, baseline %d' % (
+                name, result['status'], before['status']))
+        if result['queries'] > before['queries']:
+            regressions.append('%s: %d statements, baseline %d' % (
+                name, result['queries'], before['queries']))
+        limit = max(before['p50'] * (1 + tolerance), before['p50'] + slack)
+        if result['p50'] > limit:
+            regressions.append('%s: p50 %.1f ms, baseline %.1f ms' % (
+                name, result['p50'], before['p50']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--route', action='append', dest='routes', help='only these routes, by name')
+    parser.add_argument('--cached', action='store_true', help='keep the detail page and fragment caches')
+    parser.add_argument('--seed', action='store_true', help='reseed the database first')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a baseline')
+    parser.add_argument('--compare', metavar='PATH', help='check the results against a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 slowdown, 0.25 = 25%%')
+    parser.add_argument('--slack', type=float, default=2.0, help='p50 slowdown always allowed, in ms')
+    args = parser.parse_args()
+
+    settings = {'DEBUG': False, 'SERVER_TIMING': False}
+    if not args.cached:
+        settings.update(CACHE_BACKEND='memory', CACHE_SIZE=0, FRAGMENT_CACHE_SIZE=0)
+    app = create_app(**settings)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as source:
+            baseline = json.load(source)
+
+    with app.app_context():
+        if args.seed:
+            dataset = baseline['dataset'] if baseline else DATASET
+            seed(reset=True, random_seed=RANDOM_SEED, **dataset)
+        ids = {
+            'venue_id': db.session.query(db.func.min(Venue.id)).scalar(),
+            'artist_id': db.session.query(db.func.min(Artist.id)).scalar(),
+        }
+        if ids['venue_id'] is None or ids['artist_id'] is None:
+            sys.exit('no venues or artists found, run with --seed against a scratch database')
+        dataset = {
+            'venues': db.session.query(Venue).count(),
+            'artists': db.session.query(Artist).count(),
+            'shows': db.session.execute(db.text('SELECT count(*) FROM show')).scalar(),
+        }
+        db.session.remove()
+
+    client = app.test_client()
+    results = {}
+    for name, method, url, data in ROUTES:
+        if args.routes and name not in args.routes:
+            continue
+        result = measure(client, method, url.format(**ids), data, args.requests, args.warmup)
+        results[name] = result
+        print('%-16s %4s %-24s %8.1f ms p50 %8.1f ms p95 %4d statements' % (
+            name, method, url, result['p50'], result['p95'], result['queries']))
+        if result['status'] >= 400:
+            print('  responded %d' % result['status'])
+
+    if args.save:
+        # failing routes are left out, they are not checked until a
+        # baseline has them
+        saved = dict((name, result) for name, result in results.items() if result['status'] < 500)
+        with open(args.save, 'w') as out:
+            json.dump({'dataset': dataset, 'routes': saved}, out, indent=2, sort_keys=True)
+            out.write('\n')
+    if baseline is not None:
+        if baseline['dataset'] != dataset:
+            print('warning: database holds %s, the baseline was taken with %s' % (dataset, baseline['dataset']))
+        regressions = compare(results, baseline, args.tolerance, args.slack)
+        for regression in regressions:
+            print('REGRESSION  ' + regression)
+        if regressions:
+            sys.exit('%d regression(s) against %s' % (len(regressions), args.compare))
+
+
+if __name__ == '__main__':
+    main()
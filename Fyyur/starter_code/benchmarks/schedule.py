@@ -0,0 +1,84 @@
+"""Show scheduling benchmark: N form posts vs one batch API call.
+
+Schedules N shows (200 by default) through ``POST /shows/create`` one at a
+time, then another N through ``POST /api/v1/shows`` in a single request,
+and prints wall time and SQL statements issued for each. Both runs use
+free slots, so every show is created. Run it against a scratch database,
+``--seed`` fills it with ``benchmarks.seed`` first.
+
+    python -m benchmarks.schedule --shows 200 --seed
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import app
+from model import db, Venue, Artist, Show
+from benchmarks.seed import seed
+
+
+def free_slots(count, offset):
+    # shows of the first venue and artist a day apart, ten years out so they
+    # clash with nothing the seed generated
+    venue = db.session.query(db.func.min(Venue.id)).scalar()
+    artist = db.session.query(db.func.min(Artist.id)).scalar()
+    start = datetime(datetime.now().year + 10, 1, 1, 20, 0) + timedelta(days=offset)
+    return [{
+        'venue_id': venue,
+        'artist_id': artist,
+        'start_time': (start + timedelta(days=i)).isoformat(),
+    } for i in range(count)]
+
+
+def measure(run):
+    statements = [0]
+
+    def before_cursor_execute(*args):
+        statements[0] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        start = time.perf_counter()
+        created = run()
+        seconds = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return created, seconds, statements[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shows', type=int, default=200)
+    parser.add_argument('--seed', action='store_true')
+    args = parser.parse_args()
+
+    client = app.test_client()
+    with app.app_context():
+        if args.seed:
+            seed(venues=100, artists=500, shows=5000, reset=True)
+        singles = free_slots(args.shows, 0)
+        batch = free_slots(args.shows, args.shows)
+
+        def post_singles():
+            before = Show.query.count()
+            for row in singles:
+                client.post('/shows/create', data=row)
+            return Show.query.count() - before
+
+        def post_batch():
+            response = client.post('/api/v1/shows', data=json.dumps({'shows': batch}),
+                                   content_type='application/json')
+            return sum(1 for result in response.get_json()['data'] if result['status'] == 'created')
+
+        for name, run in (('%d single posts' % args.shows, post_singles),
+                          ('1 batch of %d' % args.shows, post_batch)):
+            created, seconds, statements = measure(run)
+            print('%-20s %4d created  %8.1f ms  %5d statements' % (
+                name, created, seconds * 1000, statements))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Search latency benchmark: ILIKE sequential scan vs trigram index.
+
+Seeds a synthetic temporary copy of the venue table (1M rows by default)
+and reports p50/p99 latency of the old ``name ILIKE '%term%'`` path
+against the ranked, trigram-indexed query used by ``search.py``.
+
+    python -m benchmarks.search --rows 1000000 --runs 200
+"""
+import argparse
+import random
+import time
+
+from app import app
+from model import db
+
+TERMS = ['hop', 'music', 'band', 'jazz', 'park', 'san', 'live', 'coffee']
+
+SEED = """
+CREATE TEMP TABLE bench_venue (LIKE venue INCLUDING DEFAULTS);
+INSERT INTO bench_venue (id, name, city, state, genres, seeking_talent)
+SELECT i,
+       'Venue ' || substr(md5(i::text), 1, 10) || ' '
+           || (ARRAY['Hop', 'Music', 'Band', 'Jazz', 'Live', 'Coffee'])[1 + i % 6],
+       (ARRAY['San Francisco', 'New York', 'Austin', 'Seattle'])[1 + i % 4],
+       (ARRAY['CA', 'NY', 'TX', 'WA'])[1 + i % 4],
+       ARRAY[(ARRAY['Jazz', 'Blues', 'Rock n Roll', 'Folk'])[1 + i % 4]],
+       false
+FROM generate_series(1, :rows) AS i;
+ANALYZE bench_venue;
+"""
+
+ILIKE = "SELECT id, name FROM bench_venue WHERE name ILIKE :pattern"
+
+RANKED = """
+SELECT id, name, count(*) OVER () AS total
+FROM bench_venue
+WHERE name ILIKE :pattern OR city ILIKE :pattern OR state ILIKE :pattern
+   OR genres_text(genres) ILIKE :pattern
+ORDER BY similarity(name, :term) DESC, name, id
+LIMIT 20
+"""
+
+INDEXES = """
+CREATE INDEX ON bench_venue USING gin (name gin_trgm_ops);
+CREATE INDEX ON bench_venue USING gin (city gin_trgm_ops);
+CREATE INDEX ON bench_venue USING gin (state gin_trgm_ops);
+CREATE INDEX ON bench_venue USING gin (genres_text(genres) gin_trgm_ops);
+ANALYZE bench_venue;
+"""
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def run(conn, sql, runs):
+    samples = []
+    for _ in range(runs):
+        term = random.choice(TERMS)
+        start = time.perf_counter()
+        conn.execute(db.text(sql), {'pattern': '%' + term + '%', 'term': term}).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    with app.app_context():
+        with db.engine.connect() as conn:
+            for statement in SEED.strip().split(';\n'):
+                conn.execute(db.text(statement), {'rows': args.rows})
+            results = [('ilike (seq scan)', run(conn, ILIKE, args.runs))]
+            for statement in INDEXES.strip().split(';\n'):
+                conn.execute(db.text(statement))
+            results.append(('ranked (trigram)', run(conn, RANKED, args.runs)))
+
+    print('%d rows, %d runs' % (args.rows, args.runs))
+    for name, (p50, p99) in results:
+        print('%-18s p50 %8.2f ms   p99 %8.2f ms' % (name, p50, p99))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Synthetic data generator for benchmarks.
+
+Fills the venue, artist and show tables of the configured database with
+generated rows. Point SQLALCHEMY_DATABASE_URI at a scratch database first,
+``--reset`` truncates all three tables. The monthly show partitions the
+show times fall in are created first, counters, caches and the typeahead
+index are refreshed afterwards as after ``flask import``.
+
+    python -m benchmarks.seed --venues 5000 --artists 20000 --shows 200000
+"""
+import argparse
+from datetime import date, timedelta
+
+from app import create_app
+from model import db
+from importer import after_load
+import partitions
+import tiles
+
+VENUES = """
+INSERT INTO venue (name, city, state, address, genres, phone, image_link,
+                   facebook_link, website_link, seeking_talent)
+SELECT 'Venue ' || i,
+       (ARRAY['San Francisco', 'New York', 'Austin', 'Seattle', 'Chicago'])[1 + i % 5],
+       (ARRAY['CA', 'NY', 'TX', 'WA', 'IL'])[1 + i % 5],
+       i || ' Main Street',
+       ARRAY[(ARRAY['Jazz', 'Blues', 'Folk', 'Rock n Roll', 'Soul'])[1 + i % 5]],
+       '555-' || lpad(i::text, 7, '0'),
+       'https://example.com/venues/' || i || '.jpg',
+       'https://www.facebook.com/venue' || i,
+       'https://venue' || i || '.example.com',
+       i % 3 = 0
+FROM generate_series(1, :count) AS i
+"""
+
+ARTISTS = """
+INSERT INTO artist (name, city, state, genres, phone, image_link,
+                    facebook_link, website_link, seeking_venue)
+SELECT (ARRAY['The ', 'Los ', 'DJ ', '', 'Big '])[1 + i % 5]
+           || initcap(substr(md5(i::text), 1, 8)),
+       (ARRAY['San Francisco', 'New York', 'Austin', 'Seattle', 'Chicago'])[1 + i % 5],
+       (ARRAY['CA', 'NY', 'TX', 'WA', 'IL'])[1 + i % 5],
+       ARRAY[(ARRAY['Jazz', 'Blues', 'Folk', 'Rock n Roll', 'Soul'])[1 + i % 5]],
+       '555-' || lpad(i::text, 7, '0'),
+       'https://example.com/artists/' || i || '.jpg',
+       'https://www.facebook.com/artist' || i,
+       'https://artist' || i || '.example.com',
+       i % 4 = 0
+FROM generate_series(1, :count) AS i
+"""
+
+# spread evenly over the past `past_days` and the coming year
+SHOWS = """
+INSERT INTO show (start_time, venue, artist)
+SELECT now() + (random() * (:past_days + 365) - :past_days) * interval '1 day',
+       (SELECT min(id) FROM venue) + floor(random() * (SELECT count(*) FROM venue))::int,
+       (SELECT min(id) FROM artist) + floor(random() * (SELECT count(*) FROM artist))::int
+FROM generate_series(1, :count) AS i
+"""
+
+
+def seed(venues=1000, artists=5000, shows=50000, reset=False, random_seed=None, past_days=365):
+    # random_seed makes the show times and pairings repeatable, with --reset
+    # the same arguments then always generate the same rows
+    today = date.today()
+    partitions.create_partitions(today - timedelta(days=past_days + 1), today + timedelta(days=366))
+    with db.engine.begin() as conn:
+        if reset:
+            conn.execute(db.text('TRUNCATE show_tile, show, venue, artist RESTART IDENTITY'))
+        if random_seed is not None:
+            conn.execute(db.text('SELECT setseed(:seed)'), {'seed': random_seed})
+        conn.execute(db.text(VENUES), {'count': venues})
+        conn.execute(db.text(ARTISTS), {'count': artists})
+        conn.execute(db.text(SHOWS), {'count': shows, 'past_days': past_days})
+        conn.execute(db.text(tiles.ADD_MISSING))
+        conn.execute(db.text('ANALYZE venue; ANALYZE artist; ANALYZE show; ANALYZE show_tile'))
+    for kind in ('venues', 'artists', 'shows'):
+        after_load(kind)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--venues', type=int, default=1000)
+    parser.add_argument('--artists', type=int, default=5000)
+    parser.add_argument('--shows', type=int, default=50000)
+    parser.add_argument('--reset', action='store_true')
+    parser.add_argument('--random-seed', type=float, help='between -1 and 1, for repeatable data')
+    parser.add_argument('--past-days', type=int, default=365, help='how far back the show times go')
+    args = parser.parse_args()
+    with create_app().app_context():
+        seed(args.venues, args.artists, args.shows, args.reset, args.random_seed, args.past_days)
+    print('seeded %d venues, %d artists, %d shows' % (args.venues, args.artists, args.shows))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Worker startup benchmark: import time and first-request latency.
+
+Starts --workers fresh interpreters one after the other, each doing what a
+gunicorn worker does on boot (``gunicorn app:app`` without --preload):
+import the app module, build the app, then serve its first requests. Prints
+per worker the time spent in each step and which of the heavy optional
+modules (WTForms, Babel, Alembic) had been loaded by then.
+
+    python -m benchmarks.startup --workers 4 --path /venues
+
+Add ``-X importtime`` to the worker command (``--importtime``) to get
+CPython's per-module import report on stderr.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY = ['wtforms', 'flask_wtf', 'babel', 'dateutil', 'flask_migrate', 'alembic']
+
+WORKER = """
+import json, sys, time
+start = time.perf_counter()
+import app as module
+imported = time.perf_counter()
+app = module.app
+created = time.perf_counter()
+client = app.test_client()
+first = client.get(sys.argv[1])
+first.get_data()
+served = time.perf_counter()
+second = client.get(sys.argv[1])
+second.get_data()
+again = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_ms': (created - imported) * 1000,
+    'first_ms': (served - created) * 1000,
+    'second_ms': (again - served) * 1000,
+    'status': first.status_code,
+    'loaded': [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY,)
+
+
+def boot(path, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', WORKER, path]
+    output = subprocess.check_output(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--path', default='/venues', help='the first request of every worker')
+    parser.add_argument('--importtime', action='store_true')
+    args = parser.parse_args()
+
+    for worker in range(args.workers):
+        result = boot(args.path, args.importtime)
+        print('worker %d  import %7.1f ms  create_app %7.1f ms  first %s %7.1f ms (%d)  '
+              'second %6.1f ms  loaded: %s' % (
+                  worker, result['import_ms'], result['create_ms'], args.path, result['first_ms'],
+                  result['status'], result['second_ms'], ', '.join(result['loaded']) or '-'))
+
+
+if __name__ == '__main__':
+    main()
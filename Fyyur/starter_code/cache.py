@@ -0,0 +1,176 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from werkzeug.local import LocalProxy
+
+#----------------------------------------------------------------------------#
+#  Backends
+#----------------------------------------------------------------------------#
+
+class LRUCache(object):
+    # In-process cache, least recently used entries are evicted once `maxsize`
+    # is reached and entries expire `ttl` seconds after they are set.
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache(object):
+    # Works against anything speaking the Redis protocol. Values are stored
+    # as JSON, so only plain dicts/lists/strings/numbers can be cached;
+    # datetimes come back as strings.
+
+    def __init__(self, url, ttl=300, prefix='fyyur:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def clear(self):
+        keys = list(self.client.scan_iter(self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+#----------------------------------------------------------------------------#
+#  Read-through cache
+#----------------------------------------------------------------------------#
+
+class Cache(object):
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def get_or_set(self, key, build):
+        # Returns the cached value for `key`, building and storing it on a
+        # miss. None results (e.g. a missing row) are not cached.
+        value = self.get(key)
+        if value is None:
+            value = build()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    # Entries written with set_part() hold a dict of parts, e.g. the pages of
+    # one venue, so deleting the key drops all of them. At most MAX_PARTS are
+    # kept per key, the oldest go first.
+
+    MAX_PARTS = 8
+
+    def get_part(self, key, part):
+        parts = self.backend.get(key)
+        value = parts.get(part) if parts else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set_part(self, key, part, value):
+        parts = dict(self.backend.get(key) or {})
+        parts.pop(part, None)
+        parts[part] = value
+        while len(parts) > self.MAX_PARTS:
+            del parts[next(iter(parts))]
+        self.backend.set(key, parts)
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def make_cache(config):
+    ttl = config.get('CACHE_TTL', 300)
+    if config.get('CACHE_BACKEND') == 'redis':
+        backend = RedisCache(config['CACHE_REDIS_URL'], ttl=ttl)
+    else:
+        backend = LRUCache(maxsize=config.get('CACHE_SIZE', 1024), ttl=ttl)
+    return Cache(backend)
+
+
+# The current app's Cache (create_app() stores it in app.extensions), for
+# views and helpers that run inside a request or app context.
+cache = LocalProxy(lambda: current_app.extensions['cache'])
+
+
+# The /artists letter index (queries.letter_index), dropped whenever an
+# artist is added, renamed or deleted.
+ARTIST_LETTERS = 'artists:letters'
+
+
+def venue_key(venue_id):
+    return 'venue:%s' % venue_id
+
+
+def artist_key(artist_id):
+    return 'artist:%s' % artist_id
@@ -0,0 +1,88 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+#----------------------------------------------------------------------------#
+# Commands
+#----------------------------------------------------------------------------#
+
+# Registered on the app by create_app(). Their imports are deferred so
+# `flask <command>` only loads what the command needs.
+
+@click.command('import')
+@with_appcontext
+@click.argument('kind', type=click.Choice(['venues', 'artists', 'shows']))
+@click.argument('path')
+@click.option('--chunk-size', default=1000, help='Rows validated and inserted per batch.')
+@click.option('--rejected', default=None, help='Where to write rejected rows.')
+def import_command(kind, path, chunk_size, rejected):
+  """Bulk load venues, artists or shows from a CSV or NDJSON file."""
+  from importer import import_file
+  report = import_file(kind, path, chunk_size, rejected)
+  click.echo('%(loaded)d rows loaded, %(rejected)d rejected (%(rejected_path)s) '
+             'in %(seconds)ss, %(rows_per_second)d rows/s' % report)
+
+@click.command('export')
+@with_appcontext
+@click.argument('kind', type=click.Choice(['venues', 'artists', 'shows']))
+@click.argument('path')
+@click.option('--format', 'format', default='ndjson', type=click.Choice(['ndjson', 'parquet']))
+@click.option('--batch-size', default=5000, help='Rows fetched per server-side cursor batch.')
+def export_command(kind, path, format, batch_size):
+  """Dump venues, artists or shows to NDJSON or Parquet."""
+  from exporter import export
+  report = export(kind, path, format, batch_size)
+  click.echo('%(rows)d rows written to %(path)s in %(seconds)ss, %(rows_per_second)d rows/s' % report)
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+  """Bundle, fingerprint and precompress the static assets."""
+  from assets import build, missing_packages
+  for package, effect in missing_packages():
+    click.secho('warning: %s is not installed, %s' % (package, effect), fg='yellow', err=True)
+  manifest = build(current_app.static_folder, current_app.config['ASSETS_FOLDER'],
+                   current_app.static_url_path)
+  for name in sorted(manifest):
+    click.echo('%-32s %s' % (name, manifest[name]))
+  click.echo('restart the app to serve the new files')
+
+@click.command('refresh-counters')
+@with_appcontext
+def refresh_counters_command():
+  """Recount upcoming shows per venue and artist, run it from cron."""
+  import counters
+  click.echo('%d counters updated' % counters.recount())
+
+@click.command('sync-show-tiles')
+@with_appcontext
+def sync_show_tiles_command():
+  """Rebuild stale or missing show tiles, see tiles.py."""
+  import tiles
+  click.echo('%d show tiles changed' % tiles.sync())
+
+@click.command('maintain-show-partitions')
+@with_appcontext
+@click.option('--months-ahead', type=int, default=None, help='Defaults to SHOW_PARTITION_MONTHS_AHEAD.')
+@click.option('--retention-months', type=int, default=None, help='Defaults to SHOW_RETENTION_MONTHS.')
+def maintain_show_partitions_command(months_ahead, retention_months):
+  """Create the coming months' show partitions and archive old ones, run it from cron."""
+  from datetime import date
+  import partitions
+  config = current_app.config
+  created, archived = partitions.maintain(
+    date.today(),
+    config['SHOW_PARTITION_MONTHS_AHEAD'] if months_ahead is None else months_ahead,
+    config['SHOW_RETENTION_MONTHS'] if retention_months is None else retention_months)
+  click.echo('created: %s' % (', '.join(created) or '-'))
+  click.echo('archived to %s: %s' % (partitions.ARCHIVE_SCHEMA, ', '.join(archived) or '-'))
+
+
+def register_commands(app):
+  for command in (import_command, export_command, build_assets_command, refresh_counters_command,
+                  sync_show_tiles_command, maintain_show_partitions_command):
+    app.cli.add_command(command)
@@ -0,0 +1,45 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from model import db
+
+#----------------------------------------------------------------------------#
+#  Upcoming show counters
+#----------------------------------------------------------------------------#
+
+# venue.upcoming_show_count and artist.upcoming_show_count are recounted for
+# the venues and artists a write touches (post-commit jobs). Shows that
+# start in the meantime are aged out by `flask refresh-counters`, which is
+# meant to run from cron, e.g. every 15 minutes:
+#
+#   */15 * * * * cd /srv/fyyur && FLASK_APP=app.py flask refresh-counters
+
+RECOUNT = """
+UPDATE {table} AS t SET upcoming_show_count = coalesce(c.n, 0)
+FROM {table} AS s
+LEFT JOIN (
+    SELECT {column} AS id, count(*) AS n FROM show
+    WHERE start_time >= now()
+    GROUP BY {column}
+) AS c ON c.id = s.id
+WHERE t.id = s.id AND t.upcoming_show_count <> coalesce(c.n, 0)
+"""
+
+
+def recount(venue_ids=None, artist_ids=None):
+    # Recomputes the counters of the given venues and artists, or of every
+    # row when called without ids. Only rows whose count changed are written.
+    # Returns the number of rows updated.
+    updated = 0
+    for table, column, ids in (('venue', 'venue', venue_ids), ('artist', 'artist', artist_ids)):
+        sql = RECOUNT.format(table=table, column=column)
+        params = {}
+        if ids is not None:
+            if not ids:
+                continue
+            sql += ' AND t.id = ANY(:ids)'
+            params['ids'] = list(ids)
+        updated += db.session.execute(db.text(sql), params).rowcount
+    db.session.commit()
+    return updated
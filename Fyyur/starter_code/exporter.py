@@ -0,0 +1,123 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import json
+import time
+
+from model import db, Venue, Artist, Show
+
+MODELS = {
+    'venues': Venue,
+    'artists': Artist,
+    'shows': Show,
+}
+
+BATCH_SIZE = 5000
+
+#----------------------------------------------------------------------------#
+#  Reading
+#----------------------------------------------------------------------------#
+
+def iter_rows(kind, batch_size=BATCH_SIZE):
+    # Yields every row of `kind` as a dict keyed by model attribute (so shows
+    # come out with venue_id/artist_id, the same keys `flask import` reads).
+    # yield_per streams the result through a server-side cursor, only one
+    # batch of rows is held in memory at a time.
+    model = MODELS[kind]
+    columns = [attr.columns[0].label(attr.key) for attr in model.__mapper__.column_attrs]
+    query = db.session.query(*columns).order_by(model.id).yield_per(batch_size)
+    for row in query:
+        yield row._asdict()
+
+
+def iter_ndjson(kind, batch_size=BATCH_SIZE):
+    for row in iter_rows(kind, batch_size):
+        yield json.dumps(row, default=str) + '\n'
+
+#----------------------------------------------------------------------------#
+#  Writing
+#----------------------------------------------------------------------------#
+
+def write_ndjson(kind, path, batch_size=BATCH_SIZE):
+    count = 0
+    with open(path, 'w') as out:
+        for line in iter_ndjson(kind, batch_size):
+            out.write(line)
+            count += 1
+    return count
+
+
+def arrow_type(pa, column_type):
+    # The pyarrow type of a model column type. Checked in this order:
+    # Boolean is no Integer, but Text is a String.
+    if isinstance(column_type, db.ARRAY):
+        return pa.list_(arrow_type(pa, column_type.item_type))
+    for sql_type, arrow in ((db.Boolean, pa.bool_()), (db.Integer, pa.int64()),
+                            (db.Float, pa.float64()), (db.DateTime, pa.timestamp('us')),
+                            (db.Date, pa.date32()), (db.String, pa.string())):
+        if isinstance(column_type, sql_type):
+            return arrow
+    raise TypeError('no Parquet type for %r' % column_type)
+
+
+def arrow_schema(pa, kind):
+    # Declared up front from the model: inferred from the first batch, a
+    # column that is all NULL there would be typed null and the first later
+    # batch with a value would fail to cast.
+    return pa.schema([
+        pa.field(attr.key, arrow_type(pa, attr.columns[0].type), nullable=attr.columns[0].nullable)
+        for attr in MODELS[kind].__mapper__.column_attrs
+    ])
+
+
+def write_parquet(kind, path, batch_size=BATCH_SIZE):
+    # Columnar output, one row group per batch. Needs pyarrow.
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError('Parquet export needs pyarrow: pip install pyarrow')
+    schema = arrow_schema(pa, kind)
+    count = 0
+    writer = None
+    batch = []
+
+    def flush():
+        nonlocal writer
+        table = pa.Table.from_pylist(batch, schema=schema)
+        if writer is None:
+            writer = pq.ParquetWriter(path, schema)
+        writer.write_table(table)
+        del batch[:]
+
+    try:
+        for row in iter_rows(kind, batch_size):
+            batch.append(row)
+            count += 1
+            if len(batch) == batch_size:
+                flush()
+        if batch or writer is None:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+WRITERS = {
+    'ndjson': write_ndjson,
+    'parquet': write_parquet,
+}
+
+
+def export(kind, path, format='ndjson', batch_size=BATCH_SIZE):
+    start = time.perf_counter()
+    count = WRITERS[format](kind, path, batch_size)
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': count,
+        'seconds': round(elapsed, 2),
+        'rows_per_second': round(count / elapsed) if elapsed else 0,
+        'path': path,
+    }
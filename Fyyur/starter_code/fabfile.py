@@ -5,9 +5,11 @@ from fabric.contrib.console import confirm
 
 
 def test():
+    # route latency and query counts against the stored baseline, see
+    # benchmarks/routes.py
     with settings(warn_only=True):
         result = local(
-            "python test_tasks.py -v && python test_users.py -v", capture=True
+            "python -m benchmarks.routes --compare benchmarks/baseline.json"
         )
     if result.failed and not confirm("Tests failed. Continue?"):
         abort("Aborted at user request.")
@@ -39,9 +41,9 @@ def heroku():
 
 
 def heroku_test():
-    local(
-        "heroku run python test_tasks.py -v && heroku run python test_users.py -v"
-    )
+    # read-only requests against the deployed database, timings only: the
+    # baseline is for the machine it was saved on
+    local("heroku run python -m benchmarks.routes --requests 5")
 
 
 def deploy():
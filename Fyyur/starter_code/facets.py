@@ -0,0 +1,120 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import hashlib
+import json
+
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from model import db
+from cache import cache
+
+FACETS = ('genre', 'state', 'city')
+# values listed per facet, the most common ones; selected values are always
+# listed
+FACET_LIMIT = 20
+
+#----------------------------------------------------------------------------#
+#  Filters
+#----------------------------------------------------------------------------#
+
+def parse_filters(args):
+    # {"genre": ["Blues", "Jazz"], "state": ["CA"], "city": []} from
+    # ?genre=Jazz&genre=Blues&state=CA. Values are sorted so the same
+    # selection always gives the same cache key.
+    return dict(
+        (facet, sorted(set(value.strip() for value in args.getlist(facet) if value.strip())))
+        for facet in FACETS
+    )
+
+
+def filter_criteria(model, filters):
+    # SQL criteria for a parse_filters() dict. Rows must list every selected
+    # genre (genres @> ARRAY[...], served by the genres GIN index) and be in
+    # one of the selected states and cities.
+    criteria = []
+    if filters['genre']:
+        criteria.append(model.genres.op('@>')(db.cast(filters['genre'], ARRAY(db.String))))
+    if filters['state']:
+        criteria.append(model.state.in_(filters['state']))
+    if filters['city']:
+        criteria.append(model.city.in_(filters['city']))
+    return criteria
+
+#----------------------------------------------------------------------------#
+#  Facet counts
+#----------------------------------------------------------------------------#
+
+def facet_counts(model, criteria):
+    # {"genre": [{"value": "Jazz", "count": 12}, ...], "state": [...],
+    # "city": [...]} over the rows matching `criteria`, most common first.
+    # One statement: the genres are unnested next to each row and grouped
+    # by GROUPING SETS, counting distinct rows so a row listing three genres
+    # still counts once for its state and city.
+    hits = db.session.query(model.id, model.genres, model.state, model.city).filter(*criteria).subquery('hits')
+    genre = db.func.unnest(hits.c.genres).table_valued('genre').render_derived(name='g')
+    rows = (
+        db.session.query(
+            db.func.grouping(genre.c.genre).label('no_genre'),
+            db.func.grouping(hits.c.state).label('no_state'),
+            genre.c.genre,
+            hits.c.state,
+            hits.c.city,
+            db.func.count(db.distinct(hits.c.id)).label('count'),
+        )
+        .select_from(hits)
+        .outerjoin(genre, db.true())
+        .group_by(db.func.grouping_sets(genre.c.genre, hits.c.state, hits.c.city))
+        .all()
+    )
+    counts = dict((facet, []) for facet in FACETS)
+    for row in rows:
+        if not row.no_genre:
+            facet, value = 'genre', row.genre
+        elif not row.no_state:
+            facet, value = 'state', row.state
+        else:
+            facet, value = 'city', row.city
+        if value:
+            counts[facet].append({"value": value, "count": row.count})
+    for values in counts.values():
+        values.sort(key=lambda entry: (-entry['count'], entry['value']))
+    return counts
+
+
+def cached_facet_counts(model, filters, extra=(), key=''):
+    # facet_counts() under `filters` and the `extra` criteria (e.g. a search
+    # term's), read through the cache. `key` must tell different `extra`s
+    # apart. Entries are not invalidated on writes, counts can lag by up to
+    # CACHE_TTL.
+    digest = hashlib.sha1(json.dumps([filters, key], sort_keys=True).encode('utf-8')).hexdigest()
+    return cache.get_or_set(
+        'facets:%s:%s' % (model.__tablename__, digest),
+        lambda: facet_counts(model, filter_criteria(model, filters) + list(extra)),
+    )
+
+
+def facet_links(counts, filters, **values):
+    # The facet lists of layouts/facets.html. Every option carries the
+    # url_for() arguments that toggle it: the current filters with its value
+    # added or removed, plus `values` (e.g. the search term).
+    facets = []
+    for facet in FACETS:
+        entries = counts[facet][:FACET_LIMIT]
+        listed = set(entry['value'] for entry in entries)
+        entries += [{"value": value, "count": 0} for value in filters[facet] if value not in listed]
+        options = []
+        for entry in entries:
+            toggled = dict(filters)
+            toggled[facet] = sorted(set(filters[facet]) ^ set([entry['value']]))
+            args = dict(values)
+            args.update(toggled)
+            options.append({
+                "value": entry['value'],
+                "count": entry['count'],
+                "selected": entry['value'] in filters[facet],
+                "args": args,
+            })
+        facets.append({"name": facet, "options": options})
+    return facets
@@ -0,0 +1,49 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from datetime import datetime
+from functools import lru_cache
+
+#----------------------------------------------------------------------------#
+#  Datetime filter
+#----------------------------------------------------------------------------#
+
+PATTERNS = {
+    'full': "EEEE MMMM, d, y 'at' h:mma",
+    'medium': "EE MM, dd, y h:mma",
+}
+
+
+# Babel is imported on the first formatted date rather than at startup, it
+# and its locale data are a large share of a worker's boot time.
+
+@lru_cache(maxsize=None)
+def compiled_pattern(format, locale):
+    # Babel Locale and parsed DateTimePattern, built once per locale and format.
+    from babel import Locale
+    from babel.dates import parse_pattern
+    return Locale.parse(locale), parse_pattern(PATTERNS[format])
+
+
+def to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        import dateutil.parser
+        return dateutil.parser.parse(value)
+
+
+@lru_cache(maxsize=16384)
+def format_datetime(value, format='medium', locale='en'):
+    # Accepts datetimes as well as the strings older views (and cached pages
+    # coming back from Redis) hand in. Results are memoized: a listing page
+    # repeats the same start times many times over.
+    date = to_datetime(value)
+    if format in PATTERNS:
+        babel_locale, pattern = compiled_pattern(format, locale)
+        return pattern.apply(date, babel_locale)
+    from babel.dates import format_datetime as babel_format_datetime
+    return babel_format_datetime(date, format, locale=locale)
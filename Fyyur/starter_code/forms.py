@@ -2,6 +2,35 @@ from datetime import datetime
 from flask_wtf import Form
 from wtforms import StringField, SelectField, SelectMultipleField, DateTimeField, BooleanField
 from wtforms.validators import DataRequired, AnyOf, URL
+from wtforms.widgets import Select
+from model import GENRES
+
+
+class CachedSelect(Select):
+    # Select widget that keeps the rendered <select> markup. The state and
+    # genres choice lists never change, so the HTML only depends on the field
+    # name, the render arguments and the selected values; the hundreds of
+    # <option> tags are built once per combination instead of per request.
+    cache = {}
+    max_entries = 512
+
+    def __call__(self, field, **kwargs):
+        data = field.data
+        if isinstance(data, list):
+            data = tuple(data)
+        key = (self.multiple, field.name, field.id, tuple(sorted(kwargs.items())),
+               data, tuple(field.choices))
+        try:
+            html = self.cache.get(key)
+        except TypeError:
+            # unhashable render arguments, render without the cache
+            return super(CachedSelect, self).__call__(field, **kwargs)
+        if html is None:
+            html = super(CachedSelect, self).__call__(field, **kwargs)
+            if len(self.cache) >= self.max_entries:
+                self.cache.clear()
+            self.cache[key] = html
+        return html
 
 class ShowForm(Form):
     artist_id = StringField(
@@ -25,6 +54,7 @@ class VenueForm(Form):
     )
     state = SelectField(
         'state', validators=[DataRequired()],
+        widget=CachedSelect(),
         choices=[
             ('AL', 'AL'),
             ('AK', 'AK'),
@@ -91,27 +121,8 @@ class VenueForm(Form):
     genres = SelectMultipleField(
         # TODO implement enum restriction
         'genres', validators=[DataRequired()],
-        choices=[
-            ('Alternative', 'Alternative'),
-            ('Blues', 'Blues'),
-            ('Classical', 'Classical'),
-            ('Country', 'Country'),
-            ('Electronic', 'Electronic'),
-            ('Folk', 'Folk'),
-            ('Funk', 'Funk'),
-            ('Hip-Hop', 'Hip-Hop'),
-            ('Heavy Metal', 'Heavy Metal'),
-            ('Instrumental', 'Instrumental'),
-            ('Jazz', 'Jazz'),
-            ('Musical Theatre', 'Musical Theatre'),
-            ('Pop', 'Pop'),
-            ('Punk', 'Punk'),
-            ('R&B', 'R&B'),
-            ('Reggae', 'Reggae'),
-            ('Rock n Roll', 'Rock n Roll'),
-            ('Soul', 'Soul'),
-            ('Other', 'Other'),
-        ]
+        widget=CachedSelect(multiple=True),
+        choices=[(genre, genre) for genre in GENRES]
     )
     facebook_link = StringField(
         'facebook_link', validators=[URL()]
@@ -137,6 +148,7 @@ class ArtistForm(Form):
     )
     state = SelectField(
         'state', validators=[DataRequired()],
+        widget=CachedSelect(),
         choices=[
             ('AL', 'AL'),
             ('AK', 'AK'),
@@ -200,27 +212,8 @@ class ArtistForm(Form):
     )
     genres = SelectMultipleField(
         'genres', validators=[DataRequired()],
-        choices=[
-            ('Alternative', 'Alternative'),
-            ('Blues', 'Blues'),
-            ('Classical', 'Classical'),
-            ('Country', 'Country'),
-            ('Electronic', 'Electronic'),
-            ('Folk', 'Folk'),
-            ('Funk', 'Funk'),
-            ('Hip-Hop', 'Hip-Hop'),
-            ('Heavy Metal', 'Heavy Metal'),
-            ('Instrumental', 'Instrumental'),
-            ('Jazz', 'Jazz'),
-            ('Musical Theatre', 'Musical Theatre'),
-            ('Pop', 'Pop'),
-            ('Punk', 'Punk'),
-            ('R&B', 'R&B'),
-            ('Reggae', 'Reggae'),
-            ('Rock n Roll', 'Rock n Roll'),
-            ('Soul', 'Soul'),
-            ('Other', 'Other'),
-        ]
+        widget=CachedSelect(multiple=True),
+        choices=[(genre, genre) for genre in GENRES]
      )
     facebook_link = StringField(
         # TODO implement enum restriction
@@ -0,0 +1,120 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import itertools
+import threading
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+#----------------------------------------------------------------------------#
+#  Fragment store
+#----------------------------------------------------------------------------#
+
+class FragmentCache(object):
+    # Rendered template fragments, least recently used ones are evicted once
+    # their total size goes over `budget` (in characters, roughly bytes for
+    # the mostly ASCII markup). There is no TTL: fragment keys carry the
+    # update stamps of what they render, so a changed row gets a new key and
+    # its old fragment just ages out.
+
+    def __init__(self, budget=16 * 1024 * 1024):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        size = len(key) + len(value)
+        if size > self.budget:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(key) + len(old)
+            self._data[key] = value
+            self.size += size
+            while self.size > self.budget:
+                old_key, old = self._data.popitem(last=False)
+                self.size -= len(old_key) + len(old)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "size": self.size,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+#----------------------------------------------------------------------------#
+#  {% cache %} tag
+#----------------------------------------------------------------------------#
+
+class FragmentCacheExtension(Extension):
+    # {% cache 'show', show.show_id, show.stamp %}...{% endcache %}
+    #
+    # Renders the body once per distinct key and serves it from
+    # environment.fragment_cache afterwards. Pass the id and update stamp of
+    # everything the body shows. The key also holds the template name, the
+    # tag's line and a per-compile counter, so tags never share entries and
+    # editing a template (auto reload recompiles it) drops its fragments.
+    # Without a fragment_cache the body is rendered every time.
+
+    tags = set(['cache'])
+    _compiled = itertools.count()
+
+    def __init__(self, environment):
+        super(FragmentCacheExtension, self).__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [nodes.Const('%s:%d:%d' % (parser.name, lineno, next(self._compiled)))]
+        while parser.stream.current.type != 'block_end':
+            if len(parts) > 1:
+                parser.stream.expect('comma')
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render', [nodes.List(parts)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render(self, parts, caller):
+        store = self.environment.fragment_cache
+        if store is None:
+            return caller()
+        key = '|'.join(str(part) for part in parts)
+        value = store.get(key)
+        if value is None:
+            value = caller()
+            store.set(key, str(value))
+        return Markup(value)
+
+
+def init_fragment_cache(app):
+    # FRAGMENT_CACHE_SIZE = 0 turns the {% cache %} tags into no-ops.
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    budget = app.config.get('FRAGMENT_CACHE_SIZE', 16 * 1024 * 1024)
+    app.jinja_env.fragment_cache = FragmentCache(budget) if budget else None
+    return app.jinja_env.fragment_cache
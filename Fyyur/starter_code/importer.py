@@ -0,0 +1,154 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import csv
+import json
+import time
+from itertools import islice
+
+from werkzeug.datastructures import MultiDict
+
+from forms import VenueForm, ArtistForm, ShowForm
+from model import db, Venue, Artist, Show
+from cache import cache, venue_key, artist_key, ARTIST_LETTERS
+from typeahead import index as typeahead_index
+import counters
+import tiles
+import jobs
+
+MODELS = {
+    'venues': (Venue, VenueForm),
+    'artists': (Artist, ArtistForm),
+    'shows': (Show, ShowForm),
+}
+
+#----------------------------------------------------------------------------#
+#  Reading
+#----------------------------------------------------------------------------#
+
+def read_rows(path):
+    # Streams rows from a .csv file (genres separated by ';') or from
+    # newline delimited JSON, one row at a time.
+    with open(path, newline='') as source:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(source):
+                if row.get('genres'):
+                    row['genres'] = row['genres'].split(';')
+                yield row
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def to_formdata(row):
+    formdata = MultiDict()
+    for key, value in row.items():
+        values = value if isinstance(value, list) else [value]
+        for value in values:
+            if isinstance(value, bool):
+                value = 'true' if value else 'false'
+            if value is not None:
+                formdata.add(key, str(value))
+    return formdata
+
+#----------------------------------------------------------------------------#
+#  Validation
+#----------------------------------------------------------------------------#
+
+def validate(form_class, row):
+    # Returns (mapping, None) for a valid row or (None, errors), using the
+    # same rules as the create forms.
+    form = form_class(formdata=to_formdata(row), meta={'csrf': False})
+    if not form.validate():
+        return None, form.errors
+    data = form.data
+    if form_class is ShowForm:
+        try:
+            data['artist_id'] = int(data['artist_id'])
+            data['venue_id'] = int(data['venue_id'])
+        except (TypeError, ValueError):
+            return None, {'artist_id/venue_id': ['must be integers']}
+    return data, None
+
+
+def missing_references(mappings):
+    # Shows pointing at venues or artists that do not exist, looked up with
+    # one IN query per side for the whole chunk.
+    venue_ids = set(m['venue_id'] for m in mappings)
+    artist_ids = set(m['artist_id'] for m in mappings)
+    venues = set(row.id for row in db.session.query(Venue.id).filter(Venue.id.in_(venue_ids)))
+    artists = set(row.id for row in db.session.query(Artist.id).filter(Artist.id.in_(artist_ids)))
+    return [m for m in mappings if m['venue_id'] not in venues or m['artist_id'] not in artists]
+
+#----------------------------------------------------------------------------#
+#  Loading
+#----------------------------------------------------------------------------#
+
+def import_file(kind, path, chunk_size=1000, rejected_path=None):
+    # Validates and inserts the rows of `path` in chunks of `chunk_size`, one
+    # executemany and one commit per chunk. Rejected rows are written with
+    # their errors to `rejected_path` (default: <path>.rejected.ndjson).
+    model, form_class = MODELS[kind]
+    rejected_path = rejected_path or path + '.rejected.ndjson'
+    loaded = rejected = 0
+    venue_ids, artist_ids = set(), set()
+    start = time.perf_counter()
+    rows = read_rows(path)
+    with open(rejected_path, 'w') as rejects:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            mappings = []
+            for row in chunk:
+                mapping, errors = validate(form_class, row)
+                if errors:
+                    rejects.write(json.dumps({'row': row, 'errors': errors}) + '\n')
+                    rejected += 1
+                else:
+                    mappings.append(mapping)
+            if model is Show and mappings:
+                orphans = missing_references(mappings)
+                for mapping in orphans:
+                    row = dict(mapping, start_time=str(mapping['start_time']))
+                    rejects.write(json.dumps({'row': row, 'errors': {'venue_id/artist_id': ['does not exist']}}) + '\n')
+                rejected += len(orphans)
+                orphans = set(map(id, orphans))
+                mappings = [m for m in mappings if id(m) not in orphans]
+                venue_ids.update(m['venue_id'] for m in mappings)
+                artist_ids.update(m['artist_id'] for m in mappings)
+            db.session.bulk_insert_mappings(model, mappings)
+            db.session.commit()
+            loaded += len(mappings)
+    if model is Show:
+        # one pass for the whole file, bulk inserts do not return the ids
+        tiles.add_missing()
+        db.session.commit()
+    after_load(kind, venue_ids, artist_ids)
+    elapsed = time.perf_counter() - start
+    return {
+        'loaded': loaded,
+        'rejected': rejected,
+        'seconds': round(elapsed, 2),
+        'rows_per_second': round((loaded + rejected) / elapsed) if elapsed else 0,
+        'rejected_path': rejected_path,
+    }
+
+
+def after_load(kind, venue_ids=None, artist_ids=None):
+    # The upkeep the write views leave to post-commit jobs, once for a whole
+    # bulk load of `kind`. For shows, venue_ids and artist_ids are the rows
+    # that got shows, None for every row.
+    if kind == 'shows':
+        counters.recount(venue_ids=venue_ids, artist_ids=artist_ids)
+        if venue_ids is None or artist_ids is None:
+            jobs.enqueue_upkeep(cache.clear)
+        else:
+            jobs.enqueue_upkeep(cache.delete, *[venue_key(id) for id in venue_ids]
+                                + [artist_key(id) for id in artist_ids])
+    else:
+        if kind == 'artists':
+            jobs.enqueue_upkeep(cache.delete, ARTIST_LETTERS)
+        jobs.enqueue_upkeep(typeahead_index.invalidate, kind)
@@ -0,0 +1,76 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import hmac
+from functools import wraps
+
+from flask import Blueprint, current_app, jsonify, request, abort
+
+from model import db
+from cache import cache
+from jobs import queue
+from pool import pool_stats
+
+bp = Blueprint('internal', __name__, url_prefix='/_internal')
+
+#----------------------------------------------------------------------------#
+#  Access
+#----------------------------------------------------------------------------#
+
+LOOPBACK = ('127.0.0.1', '::1')
+
+
+def operator_request():
+  # True for a request sending `Authorization: Bearer <INTERNAL_TOKEN>`, or
+  # coming from this machine when INTERNAL_TRUST_LOOPBACK is set. Nothing
+  # else qualifies, a missing token refuses everyone.
+  token = current_app.config.get('INTERNAL_TOKEN')
+  if token and hmac.compare_digest(request.headers.get('Authorization', ''), 'Bearer ' + token):
+    return True
+  return bool(current_app.config.get('INTERNAL_TRUST_LOOPBACK')) and request.remote_addr in LOOPBACK
+
+
+def operators_only(view):
+  @wraps(view)
+  def wrapped(*args, **kwargs):
+    if not operator_request():
+      abort(403)
+    return view(*args, **kwargs)
+  return wrapped
+
+
+@bp.before_request
+def restrict():
+  if not operator_request():
+    abort(403)
+
+#----------------------------------------------------------------------------#
+#  Stats
+#----------------------------------------------------------------------------#
+
+@bp.route('/cache')
+def cache_stats():
+  return jsonify(cache.stats())
+
+@bp.route('/jobs')
+def job_stats():
+  return jsonify(queue.stats())
+
+@bp.route('/fragments')
+def fragment_stats():
+  fragment_cache = current_app.jinja_env.fragment_cache
+  return jsonify(fragment_cache.stats() if fragment_cache else {"enabled": False})
+
+@bp.route('/pool')
+def pool_status():
+  return jsonify(pool_stats(db.engine.pool))
+
+@bp.route('/replicas')
+def replica_status():
+  replicas = current_app.extensions.get('replicas')
+  return jsonify(replicas.status() if replicas else [])
+
+@bp.route('/profile')
+def profile_stats():
+  return jsonify(current_app.extensions['profiler'].stats())
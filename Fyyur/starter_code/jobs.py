@@ -0,0 +1,179 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.local import LocalProxy
+
+from model import db
+import routing
+
+#----------------------------------------------------------------------------#
+#  Backends
+#----------------------------------------------------------------------------#
+
+# A backend runs the jobs JobQueue hands it: submit(run, delay) calls run()
+# once, `delay` seconds from now, and shutdown() waits for the jobs it has
+# started. Anything with those two methods can stand in for the ones below.
+
+class ThreadBackend(object):
+    # Runs jobs on a pool of `workers` threads in this process. Retries wait
+    # on a timer thread rather than on a worker. Jobs still queued at exit
+    # run before the process ends, retries still waiting are dropped.
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fyyur-jobs')
+
+    def submit(self, run, delay=0):
+        if delay:
+            timer = threading.Timer(delay, self.executor.submit, (run,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self.executor.submit(run)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+class SyncBackend(object):
+    # Runs each job on the spot, retries included, in the thread that
+    # enqueued it. For tests and scripts that need the side effects done
+    # before they go on.
+
+    def submit(self, run, delay=0):
+        if delay:
+            time.sleep(delay)
+        run()
+
+    def shutdown(self):
+        pass
+
+#----------------------------------------------------------------------------#
+#  Job queue
+#----------------------------------------------------------------------------#
+
+class JobQueue(object):
+    # Runs fn(*args, **kwargs) in `app`'s context through `backend`. A job
+    # that raises is retried up to `retries` times, `backoff` seconds later
+    # and twice as long before each further retry, then logged and dropped.
+    # `depth` counts the jobs enqueued and not yet done or dropped, waiting
+    # retries included.
+
+    def __init__(self, app, backend, retries=3, backoff=0.5):
+        self.app = app
+        self.backend = backend
+        self.retries = retries
+        self.backoff = backoff
+        self.depth = 0
+        self.max_depth = 0
+        self.enqueued = 0
+        self.done = 0
+        self.retried = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, fn, *args, **kwargs):
+        self.enqueue_in(0, fn, *args, **kwargs)
+
+    def enqueue_in(self, delay, fn, *args, **kwargs):
+        # Same as enqueue(), with the first attempt `delay` seconds from now.
+        with self._lock:
+            self.enqueued += 1
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+        self.backend.submit(lambda: self._run(fn, args, kwargs, 0), delay)
+
+    def _call(self, fn, args, kwargs):
+        if has_app_context() and current_app._get_current_object() is self.app:
+            # SyncBackend, inside the request or command that enqueued it:
+            # its context and session are reused, a new app context would
+            # tear the session down on exit
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                db.session.rollback()
+                raise
+        else:
+            with self.app.app_context():
+                fn(*args, **kwargs)
+
+    def _run(self, fn, args, kwargs, attempt):
+        try:
+            self._call(fn, args, kwargs)
+        except Exception:
+            if attempt == self.retries:
+                self.app.logger.exception('job %s failed after %d attempts',
+                                          getattr(fn, '__qualname__', fn), attempt + 1)
+                with self._lock:
+                    self.failed += 1
+                    self.depth -= 1
+                return
+        else:
+            with self._lock:
+                self.done += 1
+                self.depth -= 1
+            return
+        # retried outside the except block, SyncBackend runs it right here
+        with self._lock:
+            self.retried += 1
+        self.backend.submit(lambda: self._run(fn, args, kwargs, attempt + 1),
+                            self.backoff * 2 ** attempt)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "depth": self.depth,
+                "max_depth": self.max_depth,
+                "enqueued": self.enqueued,
+                "done": self.done,
+                "retried": self.retried,
+                "failed": self.failed,
+            }
+
+
+def make_queue(app):
+    config = app.config
+    if config.get('JOBS_BACKEND') == 'sync':
+        backend = SyncBackend()
+    else:
+        backend = ThreadBackend(workers=config.get('JOBS_WORKERS', 2))
+    return JobQueue(app, backend, retries=config.get('JOBS_RETRIES', 3),
+                    backoff=config.get('JOBS_RETRY_BACKOFF', 0.5))
+
+
+# The current app's JobQueue (create_app() stores it in app.extensions).
+queue = LocalProxy(lambda: current_app.extensions['jobs'])
+
+#----------------------------------------------------------------------------#
+#  Post-commit jobs
+#----------------------------------------------------------------------------#
+
+# Write views commit their rows and the read models that must change with
+# them (show tiles), and leave the upkeep that can trail the write by a
+# moment to jobs: page cache eviction, the typeahead index, the upcoming
+# show counters. Until such a job has run, other requests may still see the
+# old cached page.
+#
+# With read replicas each job runs a second time REPLICA_PIN_SECONDS later:
+# a request that read a lagging replica in between may have cached the old
+# page again. Post-commit jobs must therefore be safe to run twice.
+
+def enqueue_upkeep(fn, *args, **kwargs):
+    # Enqueues fn(*args, **kwargs) now, and again once the replicas caught up.
+    app = current_app._get_current_object()
+    app.extensions['jobs'].enqueue(fn, *args, **kwargs)
+    if app.extensions.get('replicas'):
+        app.extensions['jobs'].enqueue_in(app.config.get('REPLICA_PIN_SECONDS', 5), fn, *args, **kwargs)
+
+
+def after_commit(fn, *args, **kwargs):
+    # Enqueues fn(*args, **kwargs) through enqueue_upkeep() once the current
+    # db.session transaction commits, nothing if it rolls back.
+    routing.after_commit(db.session, lambda: enqueue_upkeep(fn, *args, **kwargs))
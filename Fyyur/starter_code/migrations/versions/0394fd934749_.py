@@ -0,0 +1,49 @@
+"""show foreign keys and time-range indexes
+
+Revision ID: 0394fd934749
+Revises: 7a29e481cbda
+Create Date: 2026-10-18 18:31:47.220934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0394fd934749'
+down_revision = '7a29e481cbda'
+branch_labels = None
+depends_on = None
+
+# Shows pointing at venues or artists that no longer exist, the foreign
+# keys can not be added while there are any.
+ORPHANS = (
+    'FROM show '
+    'WHERE venue NOT IN (SELECT id FROM venue) '
+    'OR artist NOT IN (SELECT id FROM artist)'
+)
+
+
+def upgrade():
+    # They are not deleted here, the migration stops and names the count so
+    # they can be looked at (SELECT * <ORPHANS>) and removed by hand.
+    orphans = op.get_bind().execute(sa.text('SELECT count(*) ' + ORPHANS)).scalar()
+    if orphans:
+        raise RuntimeError(
+            '%d shows reference a missing venue or artist, delete or fix them '
+            'before upgrading: SELECT * %s' % (orphans, ORPHANS))
+    op.create_foreign_key('show_venue_fkey', 'show', 'venue', ['venue'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('show_artist_fkey', 'show', 'artist', ['artist'], ['id'])
+    op.create_index('ix_show_venue_start_time', 'show', ['venue', 'start_time'])
+    op.create_index('ix_show_artist_start_time', 'show', ['artist', 'start_time'])
+    # a plain index, a partial one on `start_time >= <date>` would need
+    # rebuilding as the date falls behind
+    op.create_index('ix_show_start_time', 'show', ['start_time'])
+
+
+def downgrade():
+    op.drop_index('ix_show_start_time', table_name='show')
+    op.drop_index('ix_show_artist_start_time', table_name='show')
+    op.drop_index('ix_show_venue_start_time', table_name='show')
+    op.drop_constraint('show_artist_fkey', 'show', type_='foreignkey')
+    op.drop_constraint('show_venue_fkey', 'show', type_='foreignkey')
@@ -0,0 +1,32 @@
+"""upcoming show counters on venue and artist
+
+Revision ID: 1c01aa608d5b
+Revises: 0394fd934749
+Create Date: 2026-10-18 19:24:05.813377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c01aa608d5b'
+down_revision = '0394fd934749'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('venue', sa.Column('upcoming_show_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('artist', sa.Column('upcoming_show_count', sa.Integer(), server_default='0', nullable=False))
+    for table in ('venue', 'artist'):
+        op.execute(
+            'UPDATE {0} SET upcoming_show_count = ('
+            'SELECT count(*) FROM show '
+            'WHERE show.{0} = {0}.id AND show.start_time >= now())'.format(table)
+        )
+
+
+def downgrade():
+    op.drop_column('artist', 'upcoming_show_count')
+    op.drop_column('venue', 'upcoming_show_count')
@@ -0,0 +1,28 @@
+"""show venue and artist NOT NULL again
+
+Revision ID: 2b7e4c9a1f50
+Revises: f3b8c61d2a95
+Create Date: 2026-10-19 09:12:44.501823
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7e4c9a1f50'
+down_revision = 'f3b8c61d2a95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the partitioned show table was created without them, the model and
+    # the pre-partitioning table have them (set on the partitions too)
+    op.alter_column('show', 'venue', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('show', 'artist', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade():
+    op.alter_column('show', 'artist', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('show', 'venue', existing_type=sa.Integer(), nullable=True)
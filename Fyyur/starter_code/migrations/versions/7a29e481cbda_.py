@@ -0,0 +1,43 @@
+"""trigram search indexes on venue and artist
+
+Revision ID: 7a29e481cbda
+Revises: 53f6b5a12033
+Create Date: 2026-10-18 18:02:11.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a29e481cbda'
+down_revision = '53f6b5a12033'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # array_to_string() is only STABLE, an IMMUTABLE wrapper is needed to
+    # index the genres array as text
+    op.execute(
+        "CREATE OR REPLACE FUNCTION genres_text(varchar[]) RETURNS text "
+        "LANGUAGE sql IMMUTABLE AS $$ SELECT array_to_string($1, ' ') $$"
+    )
+    for table in ('venue', 'artist'):
+        for column in ('name', 'city', 'state'):
+            op.execute(
+                'CREATE INDEX ix_{0}_{1}_trgm ON {0} '
+                'USING gin ({1} gin_trgm_ops)'.format(table, column)
+            )
+        op.execute(
+            'CREATE INDEX ix_{0}_genres_trgm ON {0} '
+            'USING gin (genres_text(genres) gin_trgm_ops)'.format(table)
+        )
+
+
+def downgrade():
+    for table in ('venue', 'artist'):
+        for column in ('name', 'city', 'state', 'genres'):
+            op.execute('DROP INDEX IF EXISTS ix_{0}_{1}_trgm'.format(table, column))
+    op.execute('DROP FUNCTION IF EXISTS genres_text(varchar[])')
@@ -0,0 +1,26 @@
+"""cascade show deletes from artist
+
+Revision ID: 8c3d1e7f4b92
+Revises: 2b7e4c9a1f50
+Create Date: 2026-10-19 09:40:17.093315
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3d1e7f4b92'
+down_revision = '2b7e4c9a1f50'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # as show_venue_fkey: deleting an artist deletes their shows
+    op.drop_constraint('show_artist_fkey', 'show', type_='foreignkey')
+    op.create_foreign_key('show_artist_fkey', 'show', 'artist', ['artist'], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    op.drop_constraint('show_artist_fkey', 'show', type_='foreignkey')
+    op.create_foreign_key('show_artist_fkey', 'show', 'artist', ['artist'], ['id'])
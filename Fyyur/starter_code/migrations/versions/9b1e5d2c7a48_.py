@@ -0,0 +1,34 @@
+"""show slot indexes for the batch scheduler
+
+Revision ID: 9b1e5d2c7a48
+Revises: 1c01aa608d5b
+Create Date: 2026-10-18 20:12:31.504117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1e5d2c7a48'
+down_revision = '1c01aa608d5b'
+branch_labels = None
+depends_on = None
+
+# Must match scheduling.SHOW_LENGTH.
+SLOT = "tsrange(start_time, start_time + interval '3 hours')"
+
+
+def upgrade():
+    # btree_gist lets the integer venue/artist columns sit in a GiST index
+    # next to the range. These are plain indexes rather than exclusion
+    # constraints: existing data may already hold overlapping shows, the
+    # scheduler checks new ones instead.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.create_index('ix_show_venue_slot', 'show', ['venue', sa.text(SLOT)], postgresql_using='gist')
+    op.create_index('ix_show_artist_slot', 'show', ['artist', sa.text(SLOT)], postgresql_using='gist')
+
+
+def downgrade():
+    op.drop_index('ix_show_artist_slot', table_name='show')
+    op.drop_index('ix_show_venue_slot', table_name='show')
@@ -0,0 +1,24 @@
+"""artist (name, id) index for the keyset paginated directory
+
+Revision ID: c3f81e0a6d25
+Revises: 9b1e5d2c7a48
+Create Date: 2026-10-18 21:02:47.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f81e0a6d25'
+down_revision = '9b1e5d2c7a48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_artist_name_id', 'artist', ['name', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_artist_name_id', table_name='artist')
@@ -0,0 +1,27 @@
+"""GIN indexes on venue and artist genres for faceted browsing
+
+Revision ID: d71a4e9b3f02
+Revises: c3f81e0a6d25
+Create Date: 2026-10-18 21:40:12.604871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd71a4e9b3f02'
+down_revision = 'c3f81e0a6d25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # default array_ops, for the @> containment filters in facets.py
+    op.create_index('ix_venue_genres', 'venue', ['genres'], postgresql_using='gin')
+    op.create_index('ix_artist_genres', 'artist', ['genres'], postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_artist_genres', table_name='artist')
+    op.drop_index('ix_venue_genres', table_name='venue')
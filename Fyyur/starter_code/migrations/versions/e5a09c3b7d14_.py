@@ -0,0 +1,48 @@
+"""show_tile read model
+
+Revision ID: e5a09c3b7d14
+Revises: d71a4e9b3f02
+Create Date: 2026-10-18 22:15:38.220954
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a09c3b7d14'
+down_revision = 'd71a4e9b3f02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('show_tile',
+    sa.Column('show_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=True),
+    sa.Column('venue_id', sa.Integer(), nullable=False),
+    sa.Column('venue_name', sa.String(), nullable=True),
+    sa.Column('venue_image_link', sa.String(length=500), nullable=True),
+    sa.Column('artist_id', sa.Integer(), nullable=False),
+    sa.Column('artist_name', sa.String(), nullable=True),
+    sa.Column('artist_image_link', sa.String(length=500), nullable=True),
+    sa.PrimaryKeyConstraint('show_id')
+    )
+    # filled before the indexes are built, one sort each instead of index
+    # maintenance per row
+    op.execute(
+        'INSERT INTO show_tile (show_id, start_time, venue_id, venue_name, venue_image_link, '
+        'artist_id, artist_name, artist_image_link) '
+        'SELECT s.id, s.start_time, v.id, v.name, v.image_link, a.id, a.name, a.image_link '
+        'FROM show s JOIN venue v ON v.id = s.venue JOIN artist a ON a.id = s.artist'
+    )
+    op.create_index('ix_show_tile_start_time', 'show_tile', ['start_time', 'show_id'])
+    op.create_index('ix_show_tile_venue_start_time', 'show_tile', ['venue_id', 'start_time'])
+    op.create_index('ix_show_tile_artist_start_time', 'show_tile', ['artist_id', 'start_time'])
+
+
+def downgrade():
+    op.drop_index('ix_show_tile_artist_start_time', table_name='show_tile')
+    op.drop_index('ix_show_tile_venue_start_time', table_name='show_tile')
+    op.drop_index('ix_show_tile_start_time', table_name='show_tile')
+    op.drop_table('show_tile')
@@ -0,0 +1,115 @@
+"""partition show by month
+
+Revision ID: f3b8c61d2a95
+Revises: e5a09c3b7d14
+Create Date: 2026-10-18 23:41:06.318442
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8c61d2a95'
+down_revision = 'e5a09c3b7d14'
+branch_labels = None
+depends_on = None
+
+# Must match scheduling.SHOW_LENGTH.
+SLOT = "tsrange(start_time, start_time + interval '3 hours')"
+# Monthly partitions are created up to this many months ahead, later shows
+# go to show_default until `flask maintain-show-partitions` catches up.
+MONTHS_AHEAD = 12
+
+INDEXES = [
+    ('ix_show_start_time', ['start_time'], {}),
+    ('ix_show_venue_start_time', ['venue', 'start_time'], {}),
+    ('ix_show_artist_start_time', ['artist', 'start_time'], {}),
+    ('ix_show_venue_slot', ['venue', sa.text(SLOT)], {'postgresql_using': 'gist'}),
+    ('ix_show_artist_slot', ['artist', sa.text(SLOT)], {'postgresql_using': 'gist'}),
+]
+
+
+def add_months(month, count):
+    months = month.year * 12 + month.month - 1 + count
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def upgrade():
+    # a show without a start time fits no partition, and is listed nowhere
+    op.execute('DELETE FROM show WHERE start_time IS NULL')
+    op.execute('ALTER TABLE show RENAME TO show_unpartitioned')
+    # index and primary key names are schema wide, the new table reuses them
+    for name in ('ix_show_start_time', 'ix_show_venue_start_time', 'ix_show_artist_start_time',
+                 'ix_show_venue_slot', 'ix_show_artist_slot'):
+        op.drop_index(name, table_name='show_unpartitioned')
+    op.execute('ALTER TABLE show_unpartitioned RENAME CONSTRAINT show_pkey TO show_unpartitioned_pkey')
+    # the id sequence moves over to the new table
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY NONE')
+    op.execute(
+        "CREATE TABLE show ("
+        " id integer NOT NULL DEFAULT nextval('show_id_seq'),"
+        " start_time timestamp without time zone NOT NULL,"
+        " artist integer,"
+        " venue integer,"
+        " CONSTRAINT show_pkey PRIMARY KEY (id, start_time),"
+        " CONSTRAINT show_venue_fkey FOREIGN KEY (venue) REFERENCES venue (id) ON DELETE CASCADE,"
+        " CONSTRAINT show_artist_fkey FOREIGN KEY (artist) REFERENCES artist (id)"
+        ") PARTITION BY RANGE (start_time)"
+    )
+    op.execute('CREATE TABLE show_default PARTITION OF show DEFAULT')
+
+    first = op.get_bind().execute(sa.text('SELECT min(start_time) FROM show_unpartitioned')).scalar()
+    last = add_months(date.today().replace(day=1), MONTHS_AHEAD)
+    month = date(first.year, first.month, 1) if first else date.today().replace(day=1)
+    while month <= last:
+        op.execute(
+            "CREATE TABLE show_%04d_%02d PARTITION OF show FOR VALUES FROM ('%s') TO ('%s')"
+            % (month.year, month.month, month, add_months(month, 1))
+        )
+        month = add_months(month, 1)
+
+    # filled before the indexes are built, as for show_tile
+    op.execute(
+        'INSERT INTO show (id, start_time, artist, venue) '
+        'SELECT id, start_time, artist, venue FROM show_unpartitioned'
+    )
+    op.execute('DROP TABLE show_unpartitioned')
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY show.id')
+    for name, columns, options in INDEXES:
+        op.create_index(name, 'show', columns, **options)
+
+
+def downgrade():
+    # Partitions already moved to the show_archive schema stay there, their
+    # shows are not brought back.
+    for name, columns, options in reversed(INDEXES):
+        op.drop_index(name, table_name='show')
+    op.execute('ALTER TABLE show RENAME TO show_partitioned')
+    op.execute('ALTER TABLE show_partitioned RENAME CONSTRAINT show_pkey TO show_partitioned_pkey')
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY NONE')
+    op.execute(
+        "CREATE TABLE show ("
+        " id integer NOT NULL DEFAULT nextval('show_id_seq'),"
+        " start_time timestamp without time zone,"
+        " artist integer,"
+        " venue integer,"
+        " CONSTRAINT show_pkey PRIMARY KEY (id),"
+        " CONSTRAINT show_venue_fkey FOREIGN KEY (venue) REFERENCES venue (id) ON DELETE CASCADE,"
+        " CONSTRAINT show_artist_fkey FOREIGN KEY (artist) REFERENCES artist (id)"
+        ")"
+    )
+    op.execute(
+        'INSERT INTO show (id, start_time, artist, venue) '
+        'SELECT id, start_time, artist, venue FROM show_partitioned'
+    )
+    # drops the partitions with it
+    op.execute('DROP TABLE show_partitioned')
+    op.execute('ALTER SEQUENCE show_id_seq OWNED BY show.id')
+    op.create_index('ix_show_venue_start_time', 'show', ['venue', 'start_time'])
+    op.create_index('ix_show_artist_start_time', 'show', ['artist', 'start_time'])
+    op.create_index('ix_show_start_time', 'show', ['start_time'])
+    op.create_index('ix_show_venue_slot', 'show', ['venue', sa.text(SLOT)], postgresql_using='gist')
+    op.create_index('ix_show_artist_slot', 'show', ['artist', sa.text(SLOT)], postgresql_using='gist')
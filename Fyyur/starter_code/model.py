@@ -1,10 +1,25 @@
 
-from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, event
 
-db = SQLAlchemy()
+from routing import RoutingSQLAlchemy
+
+db = RoutingSQLAlchemy()
+
+# The genres a venue or artist can list, the choices of the forms' genres
+# fields.
+GENRES = [
+    'Alternative', 'Blues', 'Classical', 'Country', 'Electronic', 'Folk',
+    'Funk', 'Hip-Hop', 'Heavy Metal', 'Instrumental', 'Jazz',
+    'Musical Theatre', 'Pop', 'Punk', 'R&B', 'Reggae', 'Rock n Roll', 'Soul',
+    'Other',
+]
 
 class Venue(db.Model):
     __tablename__ = 'venue'
+    __table_args__ = (
+        # genre filters (genres @> ARRAY[...]), see facets.py
+        db.Index('ix_venue_genres', 'genres', postgresql_using='gin'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String)
@@ -18,10 +33,18 @@ class Venue(db.Model):
     website_link = db.Column(db.String(120))
     seeking_talent = db.Column(db.Boolean, nullable=False, default=False)
     seeking_description = db.Column(db.String(700))
+    # maintained by counters.py
+    upcoming_show_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    shows = db.relationship('Show', back_populates='venue', lazy='select')
 
 
 class Artist(db.Model):
     __tablename__ = 'artist'
+    __table_args__ = (
+        # the /artists directory's sort order and keyset
+        db.Index('ix_artist_name_id', 'name', 'id'),
+        db.Index('ix_artist_genres', 'genres', postgresql_using='gin'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String)
@@ -34,12 +57,87 @@ class Artist(db.Model):
     website_link = db.Column(db.String(120))
     seeking_venue = db.Column(db.Boolean, nullable=False, default=False)
     seeking_description = db.Column(db.String(700))
+    # maintained by counters.py
+    upcoming_show_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    shows = db.relationship('Show', back_populates='artist', lazy='select')
 
 # TODO Implement Show and Artist models, and complete all model relationships and properties, as a database migration.
 
+# Range partitioned by start_time, one partition per month (see
+# partitions.py). Postgres wants the partition key in the primary key, ids
+# stay unique through the id sequence.
 class Show(db.Model):
     __tablename__ = 'show'
-    id = db.Column(db.Integer, primary_key=True)
+    __table_args__ = (
+        db.Index('ix_show_start_time', 'start_time'),
+        db.Index('ix_show_venue_start_time', 'venue', 'start_time'),
+        db.Index('ix_show_artist_start_time', 'artist', 'start_time'),
+        {'postgresql_partition_by': 'RANGE (start_time)'},
+    )
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    start_time = db.Column(db.DateTime, primary_key=True)
+    venue_id = db.Column('venue', db.Integer, db.ForeignKey('venue.id', ondelete='CASCADE'), nullable=False)
+    artist_id = db.Column('artist', db.Integer, db.ForeignKey('artist.id', ondelete='CASCADE'), nullable=False)
+    # the pages read shows from show_tile (see below) and never load these;
+    # code that walks them for many shows should eager load with .options()
+    venue = db.relationship('Venue', back_populates='shows', lazy='select')
+    artist = db.relationship('Artist', back_populates='shows', lazy='select')
+
+
+# Read model of the show tiles on /shows and the venue and artist pages: a
+# show with the names and images it is rendered with, so every list of
+# tiles is one index range scan without joins. Maintained by tiles.py; it
+# has no foreign keys, the write paths keep it in step in their own
+# transaction and `flask sync-show-tiles` repairs any drift.
+class ShowTile(db.Model):
+    __tablename__ = 'show_tile'
+    __table_args__ = (
+        db.Index('ix_show_tile_start_time', 'start_time', 'show_id'),
+        db.Index('ix_show_tile_venue_start_time', 'venue_id', 'start_time'),
+        db.Index('ix_show_tile_artist_start_time', 'artist_id', 'start_time'),
+    )
+    show_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
     start_time = db.Column(db.DateTime)
-    venue = db.Column(db.Integer, db.ForeignKey('venue.id', ondelete='CASCADE'), nullable=False)
-    artist = db.Column(db.Integer, db.ForeignKey('artist.id'), nullable=False)
+    venue_id = db.Column(db.Integer, nullable=False)
+    venue_name = db.Column(db.String)
+    venue_image_link = db.Column(db.String(500))
+    artist_id = db.Column(db.Integer, nullable=False)
+    artist_name = db.Column(db.String)
+    artist_image_link = db.Column(db.String(500))
+
+
+# Trigram GIN indexes for search.py's ILIKE matches, as in migration
+# 7a29e481cbda. The pg_trgm extension and genres_text() (array_to_string()
+# is only STABLE, an index needs an IMMUTABLE function) are created ahead
+# of the tables, so a db.create_all() database can search too.
+event.listen(db.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+event.listen(db.metadata, 'before_create', DDL(
+    "CREATE OR REPLACE FUNCTION genres_text(varchar[]) RETURNS text "
+    "LANGUAGE sql IMMUTABLE AS $$ SELECT array_to_string($1, ' ') $$"))
+
+
+def trigram_indexes(model):
+    for column in ('name', 'city', 'state'):
+        db.Index('ix_%s_%s_trgm' % (model.__tablename__, column), getattr(model, column),
+                 postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+    db.Index('ix_%s_genres_trgm' % model.__tablename__,
+             db.func.genres_text(model.genres).label('genres_text'),
+             postgresql_using='gin', postgresql_ops={'genres_text': 'gin_trgm_ops'})
+
+
+trigram_indexes(Venue)
+trigram_indexes(Artist)
+
+# GiST indexes over the time slot each show books (see scheduling.py), for
+# the batch scheduler's overlap query. Needs the btree_gist extension for
+# the integer column, created ahead of the tables as migration 9b1e5d2c7a48
+# does.
+event.listen(db.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS btree_gist'))
+SHOW_SLOT = db.text("tsrange(start_time, start_time + interval '3 hours')")
+db.Index('ix_show_venue_slot', Show.venue_id, SHOW_SLOT, postgresql_using='gist')
+db.Index('ix_show_artist_slot', Show.artist_id, SHOW_SLOT, postgresql_using='gist')
+
+# Shows outside the monthly partitions land in show_default until
+# partitions.py moves them. Creating the table creates it too, so inserts
+# never fail for want of a partition.
+event.listen(Show.__table__, 'after_create', DDL('CREATE TABLE show_default PARTITION OF show DEFAULT'))
@@ -0,0 +1,44 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from flask import Blueprint, Response, render_template, stream_with_context
+
+from internal import operators_only
+
+bp = Blueprint('pages', __name__)
+
+#----------------------------------------------------------------------------#
+#  Home
+#----------------------------------------------------------------------------#
+
+@bp.route('/')
+def index():
+  return render_template('pages/home.html')
+
+#----------------------------------------------------------------------------#
+#  Export
+#----------------------------------------------------------------------------#
+
+# a full dump of the catalogue, for operators as the /_internal stats
+@bp.route('/export/<any(venues, artists, shows):kind>.ndjson')
+@operators_only
+def export_ndjson(kind):
+  from exporter import iter_ndjson
+  return Response(
+    stream_with_context(iter_ndjson(kind)),
+    mimetype='application/x-ndjson',
+    headers={'Content-Disposition': 'attachment; filename=%s.ndjson' % kind},
+    )
+
+#----------------------------------------------------------------------------#
+# Error handle
+#----------------------------------------------------------------------------#
+
+@bp.app_errorhandler(404)
+def not_found_error(error):
+    return render_template('errors/404.html'), 404
+
+@bp.app_errorhandler(500)
+def server_error(error):
+    return render_template('errors/500.html'), 500
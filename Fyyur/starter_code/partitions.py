@@ -0,0 +1,143 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import re
+from datetime import date
+
+from model import db
+import tiles
+
+#----------------------------------------------------------------------------#
+#  Show partitions
+#----------------------------------------------------------------------------#
+
+# show is range partitioned by start_time, one partition per calendar month
+# (show_2026_10 holds October 2026) plus show_default for shows no monthly
+# partition covers. Queries on upcoming shows only scan the partitions from
+# the current month on. The pages read show_tile, which is not partitioned,
+# so this helps writes and archiving rather than page reads.
+# `flask maintain-show-partitions` is meant to run
+# from cron once a day:
+#
+#   0 4 * * * cd /srv/fyyur && FLASK_APP=app.py flask maintain-show-partitions
+#
+# It creates the partitions of the coming months, moving any of their shows
+# out of show_default, and archives the months past the retention period:
+# their partitions are detached from show and moved to the show_archive
+# schema, where they can be dumped and dropped, and their show tiles are
+# deleted, so the pages no longer list them. Archived shows lose their
+# foreign keys, they no longer keep venues and artists from being deleted.
+
+ARCHIVE_SCHEMA = 'show_archive'
+
+PARTITION = re.compile(r'^show_(\d{4})_(\d{2})$')
+
+PARTITIONS = """
+SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'show'::regclass
+"""
+
+# A new month's shows may already sit in show_default, Postgres refuses to
+# attach a partition while they do. The partition is filled from it and
+# attached afterwards instead of being created in place.
+CREATE = "CREATE TABLE {name} (LIKE show INCLUDING DEFAULTS)"
+
+MOVE_FROM_DEFAULT = """
+WITH moved AS (
+    DELETE FROM show_default WHERE start_time >= :lower AND start_time < :upper
+    RETURNING *
+)
+INSERT INTO {name} SELECT * FROM moved
+"""
+
+ATTACH = "ALTER TABLE show ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+
+DETACH = "ALTER TABLE show DETACH PARTITION {name}"
+
+ARCHIVE = "ALTER TABLE {name} SET SCHEMA " + ARCHIVE_SCHEMA
+
+FOREIGN_KEYS = """
+SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'
+"""
+
+DROP_CONSTRAINT = 'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"'
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    months = month.year * 12 + month.month - 1 + count
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(month):
+    return 'show_%04d_%02d' % (month.year, month.month)
+
+
+def monthly_partitions():
+    # {first day of the month: partition name} of the attached partitions
+    partitions = {}
+    for (name,) in db.session.execute(db.text(PARTITIONS)):
+        match = PARTITION.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def _unlimited():
+    # moving and archiving can take longer than DB_STATEMENT_TIMEOUT
+    db.session.execute(db.text('SET LOCAL statement_timeout = 0'))
+
+
+def create_partitions(first, last):
+    # Creates the missing monthly partitions from the month of `first` to
+    # the month of `last`, each in its own transaction. Returns their names.
+    existing = monthly_partitions()
+    created = []
+    month = month_start(first)
+    while month <= month_start(last):
+        if month not in existing:
+            name = partition_name(month)
+            upper = add_months(month, 1)
+            _unlimited()
+            db.session.execute(db.text(CREATE.format(name=name)))
+            db.session.execute(db.text(MOVE_FROM_DEFAULT.format(name=name)),
+                               {'lower': month, 'upper': upper})
+            db.session.execute(db.text(ATTACH.format(name=name, lower=month, upper=upper)))
+            db.session.commit()
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def archive_partitions(before):
+    # Detaches the monthly partitions of the months before `before` into the
+    # archive schema and deletes their show tiles, one partition per
+    # transaction. Returns their names.
+    db.session.execute(db.text('CREATE SCHEMA IF NOT EXISTS ' + ARCHIVE_SCHEMA))
+    db.session.commit()
+    archived = []
+    for month, name in sorted(monthly_partitions().items()):
+        if add_months(month, 1) > month_start(before):
+            break
+        _unlimited()
+        db.session.execute(db.text(DETACH.format(name=name)))
+        db.session.execute(db.text(ARCHIVE.format(name=name)))
+        table = '%s.%s' % (ARCHIVE_SCHEMA, name)
+        for (constraint,) in db.session.execute(db.text(FOREIGN_KEYS), {'table': table}).fetchall():
+            db.session.execute(db.text(DROP_CONSTRAINT.format(table=table, constraint=constraint)))
+        tiles.shows_archived(month, add_months(month, 1))
+        db.session.commit()
+        archived.append(name)
+    return archived
+
+
+def maintain(today, months_ahead, retention_months):
+    # (created, archived) partition names, see the top of this section
+    month = month_start(today)
+    created = create_partitions(add_months(month, -retention_months), add_months(month, months_ahead))
+    archived = archive_partitions(add_months(month, -retention_months))
+    return created, archived
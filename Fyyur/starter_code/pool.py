@@ -0,0 +1,79 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import threading
+import time
+
+from sqlalchemy.pool import NullPool, QueuePool
+
+#----------------------------------------------------------------------------#
+#  Instrumented pool
+#----------------------------------------------------------------------------#
+
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool that records how long checkouts take and how many of them
+    # found the pool exhausted and had to wait for a connection.
+
+    def __init__(self, *args, **kwargs):
+        super(InstrumentedQueuePool, self).__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.checkout_time = 0.0
+        self.max_checkout_time = 0.0
+
+    def _do_get(self):
+        exhausted = self.checkedout() >= self.size() + max(self._max_overflow, 0)
+        start = time.perf_counter()
+        try:
+            return super(InstrumentedQueuePool, self)._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.waits += int(exhausted)
+                self.checkout_time += elapsed
+                self.max_checkout_time = max(self.max_checkout_time, elapsed)
+
+    def stats(self):
+        capacity = self.size() + max(self._max_overflow, 0)
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "overflow": self.overflow(),
+                "saturation": round(self.checkedout() / float(capacity), 3) if capacity else None,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "avg_checkout_ms": round(self.checkout_time / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_checkout_ms": round(self.max_checkout_time * 1000, 3),
+            }
+
+
+def pool_stats(pool):
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    # NullPool (PgBouncer mode) keeps no connections around
+    return {"pool": type(pool).__name__, "status": pool.status()}
+
+
+def engine_options(config):
+    # SQLALCHEMY_ENGINE_OPTIONS built from the DB_* settings in config.py.
+    if config['DB_PGBOUNCER']:
+        # PgBouncer does the pooling, and rejects unknown startup parameters
+        # such as `options`, so statement_timeout is left to its config.
+        return {"poolclass": NullPool}
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config['DB_POOL_SIZE'],
+        "max_overflow": config['DB_MAX_OVERFLOW'],
+        "pool_timeout": config['DB_POOL_TIMEOUT'],
+        "pool_recycle": config['DB_POOL_RECYCLE'],
+        "pool_pre_ping": config['DB_POOL_PRE_PING'],
+    }
+    if config['DB_STATEMENT_TIMEOUT']:
+        options["connect_args"] = {
+            "options": "-c statement_timeout=%d" % config['DB_STATEMENT_TIMEOUT'],
+        }
+    return options
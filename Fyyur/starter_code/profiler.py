@@ -0,0 +1,139 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from logging import Formatter, FileHandler
+
+from flask import g, request, has_request_context, request_started, request_finished
+from sqlalchemy import event
+
+from model import db
+
+#----------------------------------------------------------------------------#
+#  Per-request SQL profiler
+#----------------------------------------------------------------------------#
+
+class Profiler(object):
+    # Counts the statements every request issues and the time spent in the
+    # database, keeps running totals per endpoint and writes requests slower
+    # than SLOW_REQUEST_MS to the slow request log as one JSON object per line.
+    # A request is measured until its response is closed, so a streamed
+    # body's queries count too.
+
+    def __init__(self, app=None):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger('fyyur.slow_requests')
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.threshold = app.config.get('SLOW_REQUEST_MS', 500)
+        self.server_timing = app.config.get('SERVER_TIMING', False)
+        # the logger is process wide, every app built in the process shares
+        # one handler per log file
+        path = os.path.abspath(app.config.get('SLOW_REQUEST_LOG', 'slow_requests.log'))
+        if not any(getattr(handler, 'baseFilename', None) == path for handler in self.logger.handlers):
+            handler = FileHandler(path)
+            handler.setFormatter(Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+
+        # this app's engines only, another app's queries are not counted here
+        with app.app_context():
+            engines = [db.engine]
+        replicas = app.extensions.get('replicas')
+        if replicas:
+            engines.extend(replicas.engines)
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        request_started.connect(self._request_started, app, weak=False)
+        request_finished.connect(self._request_finished, app, weak=False)
+        app.after_request(self._add_server_timing)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'sql_profile' in g:
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not (has_request_context() and 'sql_profile' in g):
+            return
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        profile = g.sql_profile
+        profile['queries'] += 1
+        profile['db_time'] += elapsed
+        profile['statements'][(statement, repr(parameters))] += 1
+
+    def _request_started(self, sender, **extra):
+        g.sql_profile = {
+            'start': time.perf_counter(),
+            'queries': 0,
+            'db_time': 0.0,
+            'statements': Counter(),
+        }
+
+    def _summary(self, profile):
+        return {
+            'queries': profile['queries'],
+            'db_ms': round(profile['db_time'] * 1000, 2),
+            'total_ms': round((time.perf_counter() - profile['start']) * 1000, 2),
+            'duplicates': sum(n - 1 for n in profile['statements'].values() if n > 1),
+        }
+
+    def _add_server_timing(self, response):
+        # a streamed body has not run its queries yet, its header would
+        # undercount them
+        if self.server_timing and 'sql_profile' in g and not response.is_streamed:
+            summary = self._summary(g.sql_profile)
+            response.headers['Server-Timing'] = 'db;dur=%s;desc="%d queries", app;dur=%s' % (
+                summary['db_ms'], summary['queries'], summary['total_ms'])
+        return response
+
+    def _request_finished(self, sender, response, **extra):
+        # Fires before a streamed body is rendered, the request is recorded
+        # once the response is closed. The body keeps adding to the same
+        # profile dict while it streams (stream_with_context).
+        if 'sql_profile' not in g:
+            return
+        profile = g.sql_profile
+        summary = {
+            'endpoint': request.endpoint or 'unmatched',
+            'method': request.method,
+            'path': request.path,
+        }
+        response.call_on_close(lambda: self._record(profile, summary, response.status_code))
+
+    def _record(self, profile, summary, status):
+        summary.update(self._summary(profile))
+        with self._lock:
+            totals = self.endpoints.setdefault(summary['endpoint'], {
+                'requests': 0, 'queries': 0, 'db_ms': 0.0, 'total_ms': 0.0, 'duplicates': 0,
+            })
+            totals['requests'] += 1
+            for key in ('queries', 'db_ms', 'total_ms', 'duplicates'):
+                totals[key] += summary[key]
+        if summary['total_ms'] >= self.threshold:
+            summary['status'] = status
+            summary['repeated'] = [
+                {'statement': ' '.join(statement.split()), 'count': n}
+                for (statement, parameters), n in profile['statements'].most_common(5)
+                if n > 1
+            ]
+            self.logger.info(json.dumps(summary))
+
+    def stats(self):
+        with self._lock:
+            return {
+                endpoint: dict(totals,
+                               avg_queries=round(totals['queries'] / float(totals['requests']), 2),
+                               avg_db_ms=round(totals['db_ms'] / totals['requests'], 2))
+                for endpoint, totals in self.endpoints.items()
+            }
@@ -0,0 +1,425 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from datetime import datetime
+from itertools import groupby
+
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from model import db, Venue, Artist, Show, ShowTile
+
+#----------------------------------------------------------------------------#
+#  Venue areas
+#----------------------------------------------------------------------------#
+
+def venue_areas_query(criteria=()):
+    # A single query over the venue table, upcoming show counts are read from
+    # the maintained counter column (see counters.py). `criteria` narrows it
+    # down, e.g. to facet filters.
+    return (
+        db.session.query(
+            Venue.city,
+            Venue.state,
+            Venue.id,
+            Venue.name,
+            Venue.upcoming_show_count.label('num_upcoming_shows'),
+            row_version(Venue).label('stamp'),
+        )
+        .filter(*criteria)
+        .order_by(Venue.city, Venue.state, Venue.name)
+    )
+
+
+def group_areas(rows):
+    # The /venues `areas` structure from venue_areas_query() rows.
+    areas = []
+    for (city, state), venues in groupby(rows, key=lambda row: (row.city, row.state)):
+        areas.append({
+            "city": city,
+            "state": state,
+            "venues": [{
+                "id": venue.id,
+                "name": venue.name,
+                "num_upcoming_shows": venue.num_upcoming_shows,
+                "stamp": venue.stamp,
+            } for venue in venues],
+        })
+    return areas
+
+
+def venue_areas(criteria=()):
+    return group_areas(venue_areas_query(criteria).all())
+
+
+#----------------------------------------------------------------------------#
+#  Artist directory, keyset paginated
+#----------------------------------------------------------------------------#
+
+ARTISTS_PER_PAGE = 50
+MAX_ARTISTS_PER_PAGE = 200
+LETTERS = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+
+def encode_name_cursor(artist):
+    return '%s_%d' % (artist.name, artist.id)
+
+
+def decode_name_cursor(value):
+    # raises ValueError on a malformed cursor
+    name, artist_id = value.rsplit('_', 1)
+    return name, int(artist_id)
+
+
+def artist_directory_query(per_page, after=None, letter=None, criteria=()):
+    # One page of the /artists directory ordered by (name, id), reading only
+    # the columns a list item shows. `after` is a decoded cursor, `letter`
+    # starts the page at the first name from that letter on, `criteria`
+    # narrows it down (facet filters). Walks ix_artist_name_id, so every
+    # page costs the same however deep it is. Fetches one row more than
+    # per_page to tell whether a next page exists.
+    query = (
+        db.session.query(Artist.id, Artist.name, row_version(Artist).label('stamp'))
+        .filter(*criteria)
+    )
+    if after is not None:
+        query = query.filter(db.tuple_(Artist.name, Artist.id) > after)
+    elif letter in LETTERS:
+        query = query.filter(Artist.name >= letter)
+    return query.order_by(Artist.name, Artist.id).limit(per_page + 1)
+
+
+def artist_page(rows, per_page):
+    # (items, page) for the template from artist_directory_query() rows.
+    page = {"per_page": per_page, "next": None}
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        page['next'] = encode_name_cursor(rows[-1])
+    items = [{"id": row.id, "name": row.name, "stamp": row.stamp} for row in rows]
+    return items, page
+
+
+def letter_index():
+    # [{"letter": "A", "count": 120}, ...] for the directory's jump links,
+    # in one grouped pass over the artist names. Names not starting with a
+    # latin letter are counted under "#", which links to the first page.
+    # It scans the whole table, views read it through the cache (see
+    # cache.ARTIST_LETTERS).
+    initial = db.func.upper(db.func.left(Artist.name, 1))
+    counts = dict(
+        db.session.query(initial, db.func.count()).group_by(initial).all()
+    )
+    index = [{"letter": letter, "count": counts.pop(letter)} for letter in LETTERS if letter in counts]
+    other = sum(counts.values())
+    if other:
+        index.insert(0, {"letter": "#", "count": other})
+    return index
+
+#----------------------------------------------------------------------------#
+#  Upcoming shows, keyset paginated
+#----------------------------------------------------------------------------#
+
+SHOWS_PER_PAGE = 30
+MAX_SHOWS_PER_PAGE = 200
+
+
+def encode_cursor(show):
+    return '%s_%d' % (show.start_time.isoformat(), show.id)
+
+
+def decode_cursor(value):
+    # raises ValueError on a malformed cursor
+    start_time, show_id = value.rsplit('_', 1)
+    return datetime.fromisoformat(start_time), int(show_id)
+
+
+def upcoming_tiles_query(after=None):
+    # Upcoming shows from the show_tile read model, ordered by
+    # (start_time, id) from the `after` cursor on: one range scan of
+    # ix_show_tile_start_time.
+    query = (
+        db.session.query(
+            ShowTile.show_id.label('id'),
+            ShowTile.start_time,
+            ShowTile.venue_id,
+            ShowTile.venue_name,
+            ShowTile.artist_id,
+            ShowTile.artist_name,
+            ShowTile.artist_image_link,
+            row_version(ShowTile).label('stamp'),
+        )
+        .filter(ShowTile.start_time >= datetime.now())
+    )
+    if after is not None:
+        query = query.filter(db.tuple_(ShowTile.start_time, ShowTile.show_id) > after)
+    return query.order_by(ShowTile.start_time, ShowTile.show_id)
+
+
+def upcoming_shows(page, after=None):
+    # Yields show tiles ordered by (start_time, id), starting after the
+    # `after` cursor. Rows are fetched in batches while the template renders;
+    # once the page is exhausted page['next'] holds the cursor of the next
+    # page, or None on the last one.
+    query = (
+        upcoming_tiles_query(after)
+        .limit(page['per_page'] + 1)
+        .yield_per(50)
+    )
+    page['next'] = None
+    last = None
+    for count, show in enumerate(query):
+        if count == page['per_page']:
+            page['next'] = encode_cursor(last)
+            break
+        last = show
+        yield show_tile(show)
+
+
+def show_tile(row):
+    # A /shows tile from an upcoming_tiles_query() row.
+    return {
+        "show_id": row.id,
+        "venue_id": row.venue_id,
+        "venue_name": row.venue_name,
+        "artist_id": row.artist_id,
+        "artist_name": row.artist_name,
+        "artist_image_link": row.artist_image_link,
+        "start_time": row.start_time,
+        "stamp": row.stamp,
+    }
+
+#----------------------------------------------------------------------------#
+#  Venue and artist detail
+#----------------------------------------------------------------------------#
+
+PAST_SHOWS_PER_PAGE = 10
+
+# Past shows counted at most, a longer history shows as "1000+".
+PAST_SHOWS_COUNT_LIMIT = 1000
+
+
+def past_cursor(args):
+    # The ?past_before= cursor of a venue or artist page, None for the
+    # latest past shows. Raises ValueError on a malformed cursor.
+    value = args.get('past_before')
+    return decode_cursor(value) if value else None
+
+
+def page_shows(upcoming, past, past_count):
+    # The shows part of a venue or artist page from show tile rows: every
+    # upcoming show, one page of past shows (newest first, with the cursor
+    # of the next, older page in past_shows_next) and the past show count,
+    # capped at PAST_SHOWS_COUNT_LIMIT (past_shows_count_capped tells).
+    older = None
+    if len(past) > PAST_SHOWS_PER_PAGE:
+        past = past[:PAST_SHOWS_PER_PAGE]
+        older = encode_cursor(past[-1])
+    return {
+        "past_shows": [dict(row._mapping) for row in past],
+        "upcoming_shows": [dict(row._mapping) for row in upcoming],
+        "past_shows_count": min(past_count, PAST_SHOWS_COUNT_LIMIT),
+        "past_shows_count_capped": past_count > PAST_SHOWS_COUNT_LIMIT,
+        "upcoming_shows_count": len(upcoming),
+        "past_shows_next": older,
+    }
+
+
+def venue_data(venue, shows):
+    # The venue page dict from a venue row (ORM object or result row) and
+    # its page_shows().
+    data = {
+        "id": venue.id,
+        "name": venue.name,
+        "genres": venue.genres,
+        "address": venue.address,
+        "city": venue.city,
+        "state": venue.state,
+        "phone": venue.phone,
+        "website": venue.website_link,
+        "facebook_link": venue.facebook_link,
+        "seeking_talent": venue.seeking_talent,
+        "seeking_description": venue.seeking_description,
+        "image_link": venue.image_link,
+    }
+    data.update(shows)
+    return data
+
+
+def artist_data(artist, shows):
+    # The artist page dict from an artist row (ORM object or result row) and
+    # its page_shows().
+    data = {
+        "id": artist.id,
+        "name": artist.name,
+        "genres": artist.genres,
+        "city": artist.city,
+        "state": artist.state,
+        "phone": artist.phone,
+        "website": artist.website_link,
+        "facebook_link": artist.facebook_link,
+        "seeking_venue": artist.seeking_venue,
+        "seeking_description": artist.seeking_description,
+        "image_link": artist.image_link,
+    }
+    data.update(shows)
+    return data
+
+
+VENUE_TILE = (
+    ShowTile.show_id.label('id'),
+    ShowTile.artist_id,
+    ShowTile.artist_name,
+    ShowTile.artist_image_link,
+    ShowTile.start_time,
+)
+ARTIST_TILE = (
+    ShowTile.show_id.label('id'),
+    ShowTile.venue_id,
+    ShowTile.venue_name,
+    ShowTile.venue_image_link,
+    ShowTile.start_time,
+)
+
+
+def page_tiles_queries(columns, owner, past_before=None):
+    # (upcoming, past, past count) queries of a venue or artist page, the
+    # shows matching `owner` (e.g. ShowTile.venue_id == 1). Only the past
+    # page asked for is read, from the `past_before` cursor on, and the
+    # count stops one past PAST_SHOWS_COUNT_LIMIT: each query reads a
+    # bounded range of the (venue_id|artist_id, start_time) index, however
+    # long the history.
+    now = datetime.now()
+    upcoming = (
+        db.session.query(*columns)
+        .filter(owner, ShowTile.start_time >= now)
+        .order_by(ShowTile.start_time, ShowTile.show_id)
+    )
+    past = db.session.query(*columns).filter(owner, ShowTile.start_time < now)
+    if past_before is not None:
+        past = past.filter(db.tuple_(ShowTile.start_time, ShowTile.show_id) < past_before)
+    past = (
+        past.order_by(ShowTile.start_time.desc(), ShowTile.show_id.desc())
+        .limit(PAST_SHOWS_PER_PAGE + 1)
+    )
+    counted = (
+        db.session.query(ShowTile.show_id)
+        .filter(owner, ShowTile.start_time < now)
+        .limit(PAST_SHOWS_COUNT_LIMIT + 1)
+        .subquery()
+    )
+    past_count = db.session.query(db.func.count()).select_from(counted)
+    return upcoming, past, past_count
+
+
+def venue_tiles_queries(venue_id, past_before=None):
+    return page_tiles_queries(VENUE_TILE, ShowTile.venue_id == venue_id, past_before)
+
+
+def artist_tiles_queries(artist_id, past_before=None):
+    return page_tiles_queries(ARTIST_TILE, ShowTile.artist_id == artist_id, past_before)
+
+
+def _page_shows(queries):
+    upcoming, past, past_count = queries
+    return page_shows(upcoming.all(), past.all(), past_count.scalar())
+
+
+def venue_detail(venue_id, past_before=None):
+    # Data for the venue page, None if there is no such venue.
+    venue = Venue.query.get(venue_id)
+    if venue is None:
+        return None
+    return venue_data(venue, _page_shows(venue_tiles_queries(venue_id, past_before)))
+
+
+def artist_detail(artist_id, past_before=None):
+    # Data for the artist page, None if there is no such artist.
+    artist = Artist.query.get(artist_id)
+    if artist is None:
+        return None
+    return artist_data(artist, _page_shows(artist_tiles_queries(artist_id, past_before)))
+
+
+def related_artist_ids(venue_id):
+    # ids of the artists with a show at the venue
+    rows = db.session.query(Show.artist_id).filter(Show.venue_id == venue_id).distinct()
+    return [row.artist_id for row in rows]
+
+
+def related_venue_ids(artist_id):
+    # ids of the venues the artist has a show at
+    rows = db.session.query(Show.venue_id).filter(Show.artist_id == artist_id).distinct()
+    return [row.venue_id for row in rows]
+
+#----------------------------------------------------------------------------#
+#  Row versions
+#----------------------------------------------------------------------------#
+
+# Postgres bumps a row's xmin on every UPDATE, so it serves as a row version
+# without a dedicated column. The *_version() functions hash the versions of
+# every row a response is built from; the API uses them as ETags.
+
+def row_version(model):
+    return db.cast(db.literal_column(model.__tablename__ + '.xmin'), db.Text)
+
+
+def _hash(parts, *order_by):
+    return db.func.md5(db.func.string_agg(
+        db.func.concat_ws(':', *parts), aggregate_order_by(db.literal(','), *order_by)))
+
+
+def page_tiles_version(owner, past_before=None):
+    # Covers the show tiles a venue or artist page renders, read as
+    # page_tiles_queries() reads them: the upcoming shows, the past page
+    # asked for (with the row telling whether an older page follows) and
+    # the capped past count. A long history costs no more than one page.
+    upcoming, past, past_count = page_tiles_queries(
+        [ShowTile.show_id.label('id'), row_version(ShowTile).label('version')], owner, past_before)
+    upcoming, past = upcoming.subquery(), past.subquery()
+    return db.func.concat_ws(
+        '-',
+        db.session.query(_hash([upcoming.c.id, upcoming.c.version], upcoming.c.id)).scalar_subquery(),
+        db.session.query(_hash([past.c.id, past.c.version], past.c.id)).scalar_subquery(),
+        past_count.scalar_subquery(),
+    )
+
+
+def venue_version(venue_id, past_before=None):
+    # Covers the venue and the shows its page renders, None if there is no
+    # such venue.
+    return (
+        db.session.query(db.func.concat_ws(
+            '-', row_version(Venue), page_tiles_version(ShowTile.venue_id == venue_id, past_before)))
+        .filter(Venue.id == venue_id)
+        .scalar()
+    )
+
+
+def artist_version(artist_id, past_before=None):
+    # Covers the artist and the shows its page renders, None if there is no
+    # such artist.
+    return (
+        db.session.query(db.func.concat_ws(
+            '-', row_version(Artist), page_tiles_version(ShowTile.artist_id == artist_id, past_before)))
+        .filter(Artist.id == artist_id)
+        .scalar()
+    )
+
+
+def page_version(model, after, limit):
+    # Covers one page of `model` rows in id order.
+    page = (
+        db.session.query(model.id.label('id'), row_version(model).label('version'))
+        .filter(model.id > after)
+        .order_by(model.id)
+        .limit(limit)
+        .subquery()
+    )
+    return db.session.query(_hash([page.c.id, page.c.version], page.c.id)).scalar()
+
+
+def upcoming_shows_version(per_page, after=None):
+    # Covers the page upcoming_shows() would return.
+    page = upcoming_tiles_query(after).limit(per_page + 1).subquery()
+    return db.session.query(_hash(
+        [page.c.id, page.c.stamp], page.c.start_time, page.c.id)).scalar()
@@ -0,0 +1,152 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from sqlalchemy import create_engine, orm, text
+from sqlalchemy.exc import DBAPIError
+
+#----------------------------------------------------------------------------#
+#  Replicas
+#----------------------------------------------------------------------------#
+
+class ReplicaSet(object):
+    # Round-robin over the replica engines. A replica that fails its health
+    # check is skipped for `retry_after` seconds; healthy replicas are
+    # re-checked at most every `check_interval` seconds.
+
+    def __init__(self, uris, engine_options=None, check_interval=5, retry_after=30):
+        self.engines = [create_engine(uri, **(engine_options or {})) for uri in uris]
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self._checked = [0.0] * len(self.engines)
+        self._down_until = [0.0] * len(self.engines)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _healthy(self, index):
+        now = time.monotonic()
+        if self._down_until[index] > now:
+            return False
+        if now - self._checked[index] < self.check_interval:
+            return True
+        try:
+            with self.engines[index].connect() as conn:
+                conn.execute(text('SELECT 1'))
+        except DBAPIError:
+            self._down_until[index] = now + self.retry_after
+            return False
+        self._checked[index] = now
+        return True
+
+    def pick(self):
+        # Next healthy replica engine, None when all of them are down.
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.engines)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._healthy(index):
+                return self.engines[index]
+        return None
+
+    def status(self):
+        now = time.monotonic()
+        return [{"url": repr(engine.url), "healthy": self._down_until[index] <= now}
+                for index, engine in enumerate(self.engines)]
+
+
+def init_replicas(app, engine_options=None):
+    uris = app.config.get('SQLALCHEMY_REPLICA_URIS')
+    if uris:
+        app.extensions['replicas'] = ReplicaSet(uris, engine_options)
+        app.after_request(pin_to_primary)
+
+#----------------------------------------------------------------------------#
+#  Routing session
+#----------------------------------------------------------------------------#
+
+# Cookie that keeps a client on the primary for REPLICA_PIN_SECONDS after it
+# wrote, so the redirect that follows an edit doesn't read (and cache) the
+# page from a replica that hasn't caught up yet.
+PIN_COOKIE = 'fyyur_primary'
+
+
+def use_primary():
+    # Sends the rest of the current request to the primary.
+    g.use_primary = True
+
+
+def pin_to_primary(response):
+    if g.get('wrote'):
+        response.set_cookie(PIN_COOKIE, '1', max_age=current_app.config.get('REPLICA_PIN_SECONDS', 5),
+                            httponly=True, samesite='Lax')
+    return response
+
+
+class RoutingSession(SignallingSession):
+    # Statements of GET/HEAD requests go to a replica. Everything else goes to
+    # the primary: writes, requests with other methods, work outside a
+    # request (CLI commands), once the session flushed anything, the rest
+    # of the request so it reads its own writes, and requests from a client
+    # pinned by PIN_COOKIE after its last write.
+
+    def get_bind(self, mapper=None, clause=None):
+        replica = self._replica()
+        if replica is not None:
+            return replica
+        return super(RoutingSession, self).get_bind(mapper, clause)
+
+    def _replica(self):
+        if not has_request_context() or request.method not in ('GET', 'HEAD'):
+            return None
+        if self._flushing or g.get('use_primary') or PIN_COOKIE in request.cookies:
+            return None
+        replicas = current_app.extensions.get('replicas')
+        if not replicas:
+            return None
+        # one replica for the whole request, so its statements all see the
+        # same point in time (None, all replicas down, sticks too)
+        if 'replica' not in g:
+            g.replica = replicas.pick()
+        return g.replica
+
+    def flush(self, objects=None):
+        if has_request_context() and (self.new or self.dirty or self.deleted):
+            use_primary()
+        super(RoutingSession, self).flush(objects)
+
+    # Callbacks registered with after_commit() run once the transaction
+    # commits, with the session usable again, and are dropped when it rolls
+    # back or the session closes first.
+
+    def commit(self):
+        super(RoutingSession, self).commit()
+        if has_request_context():
+            g.wrote = True
+        callbacks = self.info.pop('after_commit', [])
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self.info.pop('after_commit', None)
+        super(RoutingSession, self).rollback()
+
+    def close(self):
+        self.info.pop('after_commit', None)
+        super(RoutingSession, self).close()
+
+
+def after_commit(session, callback):
+    # Calls callback() after the next commit of `session`, see RoutingSession.
+    session.info.setdefault('after_commit', []).append(callback)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
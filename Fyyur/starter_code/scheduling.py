@@ -0,0 +1,153 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from datetime import datetime, timedelta
+
+from model import db, Show
+from cache import cache, venue_key, artist_key
+import counters
+import tiles
+import jobs
+
+#----------------------------------------------------------------------------#
+#  Batch scheduling
+#----------------------------------------------------------------------------#
+
+# Shows have no end time, each one books its venue and artist for
+# SHOW_LENGTH from its start. Keep it in sync with the slot indexes in
+# model.py and migration 9b1e5d2c7a48, which make the conflict query below
+# an index scan.
+SHOW_LENGTH = timedelta(hours=3)
+MAX_BATCH = 500
+
+# Serialises batches touching the same venue or artist until commit, so two
+# concurrent batches can not both pass the conflict check for one slot.
+# Locks are taken in (class, id) order to avoid deadlocks.
+LOCK = """
+SELECT pg_advisory_xact_lock(k.class, k.id)
+FROM (SELECT DISTINCT * FROM unnest(CAST(:classes AS int[]), CAST(:ids AS int[])) AS k(class, id)
+      ORDER BY 1, 2) AS k
+"""
+
+# One set-based pass over the batch: rows naming a missing venue or artist,
+# and rows overlapping a stored show of their venue or artist.
+CONFLICTS = """
+WITH batch AS (
+    SELECT * FROM unnest(CAST(:rows AS int[]), CAST(:venues AS int[]),
+                         CAST(:artists AS int[]), CAST(:starts AS timestamp[]))
+        AS b(idx, venue, artist, start_time)
+)
+SELECT b.idx, 'venue' AS field, CAST(NULL AS int) AS show_id FROM batch b
+WHERE NOT EXISTS (SELECT 1 FROM venue WHERE venue.id = b.venue)
+UNION ALL
+SELECT b.idx, 'artist', CAST(NULL AS int) FROM batch b
+WHERE NOT EXISTS (SELECT 1 FROM artist WHERE artist.id = b.artist)
+UNION ALL
+SELECT b.idx, 'venue', s.id FROM batch b JOIN show s
+  ON s.venue = b.venue
+ AND tsrange(s.start_time, s.start_time + interval '3 hours')
+     && tsrange(b.start_time, b.start_time + interval '3 hours')
+UNION ALL
+SELECT b.idx, 'artist', s.id FROM batch b JOIN show s
+  ON s.artist = b.artist
+ AND tsrange(s.start_time, s.start_time + interval '3 hours')
+     && tsrange(b.start_time, b.start_time + interval '3 hours')
+"""
+
+
+def parse_row(row):
+    # (venue_id, artist_id, start_time) from a submitted row, raises
+    # ValueError/TypeError/KeyError on bad input.
+    start_time = row['start_time']
+    if not isinstance(start_time, datetime):
+        start_time = datetime.fromisoformat(str(start_time).strip())
+    if start_time.tzinfo is not None:
+        raise ValueError('start_time must not carry a timezone')
+    return int(row['venue_id']), int(row['artist_id']), start_time
+
+
+def _overlaps(booked, start_time):
+    return any(abs(start_time - other) < SHOW_LENGTH for other in booked)
+
+
+def schedule(rows):
+    # Schedules a batch of {venue_id, artist_id, start_time} rows in one
+    # transaction and returns one result per row, in order:
+    #   {"row": 0, "status": "created", "id": 12}
+    #   {"row": 1, "status": "invalid", "error": "..."}
+    #   {"row": 2, "status": "conflict", "conflicts": [{"on": "venue", "show_id": 7}]}
+    # Valid rows are inserted even when others are rejected. A row is also
+    # rejected when it overlaps an earlier row of the same batch
+    # ("show_id": None). The pages and counters of the venues and artists
+    # that got shows are refreshed by post-commit jobs.
+    results = [None] * len(rows)
+    parsed = {}
+    for index, row in enumerate(rows):
+        try:
+            parsed[index] = parse_row(row)
+        except (ValueError, TypeError, KeyError) as error:
+            results[index] = {"row": index, "status": "invalid", "error": str(error)}
+    if not parsed:
+        return results
+
+    indexes = sorted(parsed)
+    venues = [parsed[index][0] for index in indexes]
+    artists = [parsed[index][1] for index in indexes]
+    db.session.execute(db.text(LOCK), {
+        'classes': [1] * len(venues) + [2] * len(artists),
+        'ids': venues + artists,
+    })
+    found = db.session.execute(db.text(CONFLICTS), {
+        'rows': indexes,
+        'venues': venues,
+        'artists': artists,
+        'starts': [parsed[index][2] for index in indexes],
+    })
+    conflicts = {}
+    for row in found:
+        if row.show_id is None:
+            results[row.idx] = {"row": row.idx, "status": "invalid", "error": "unknown %s" % row.field}
+        else:
+            conflicts.setdefault(row.idx, []).append({"on": row.field, "show_id": row.show_id})
+
+    # the query only sees stored shows, overlaps inside the batch are
+    # resolved here in submission order
+    booked = {}
+    accepted = []
+    for index in indexes:
+        if results[index] is not None:
+            continue
+        venue_id, artist_id, start_time = parsed[index]
+        clashes = conflicts.get(index, [])
+        for field, key in (('venue', ('venue', venue_id)), ('artist', ('artist', artist_id))):
+            if _overlaps(booked.get(key, ()), start_time):
+                clashes.append({"on": field, "show_id": None})
+        if clashes:
+            results[index] = {"row": index, "status": "conflict", "conflicts": clashes}
+            continue
+        booked.setdefault(('venue', venue_id), []).append(start_time)
+        booked.setdefault(('artist', artist_id), []).append(start_time)
+        accepted.append(index)
+
+    if accepted:
+        # a single multi-row INSERT, whatever the batch size
+        inserted = db.session.execute(
+            Show.__table__.insert()
+            .values([{
+                'venue': parsed[index][0],
+                'artist': parsed[index][1],
+                'start_time': parsed[index][2],
+            } for index in accepted])
+            .returning(Show.id)
+        )
+        for index, row in zip(accepted, inserted):
+            results[index] = {"row": index, "status": "created", "id": row.id}
+        tiles.shows_added([results[index]['id'] for index in accepted])
+        venue_ids = set(parsed[index][0] for index in accepted)
+        artist_ids = set(parsed[index][1] for index in accepted)
+        jobs.after_commit(cache.delete, *[venue_key(id) for id in venue_ids]
+                          + [artist_key(id) for id in artist_ids])
+        jobs.after_commit(counters.recount, venue_ids=venue_ids, artist_ids=artist_ids)
+    db.session.commit()
+    return results
@@ -0,0 +1,66 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from model import db, Venue, Artist
+from queries import row_version
+
+PER_PAGE = 20
+
+#----------------------------------------------------------------------------#
+#  Search
+#----------------------------------------------------------------------------#
+
+def match(model, term):
+    # Partial, case-insensitive match on name, city, state and genres. The
+    # ILIKE predicates are served by the pg_trgm GIN indexes (model.py,
+    # migration 7a29e481cbda).
+    pattern = '%' + term + '%'
+    return db.or_(
+        model.name.ilike(pattern),
+        model.city.ilike(pattern),
+        model.state.ilike(pattern),
+        db.func.genres_text(model.genres).ilike(pattern),
+    )
+
+
+def _search(model, term, page=1, per_page=PER_PAGE, criteria=()):
+    # Rows matching `term` and the extra `criteria` (e.g. facet filters),
+    # ranked by trigram similarity of the name. Upcoming show counts (from
+    # the counter column) and the total hit count come back in the same
+    # statement. Pages count from 1, lower ones are read as the first.
+    page = max(1, page)
+    rank = db.func.similarity(model.name, term)
+    rows = (
+        db.session.query(
+            model.id,
+            model.name,
+            model.upcoming_show_count.label('num_upcoming_shows'),
+            row_version(model).label('version'),
+            db.func.count().over().label('total'),
+        )
+        .filter(match(model, term), *criteria)
+        .order_by(rank.desc(), model.name, model.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+        .all()
+    )
+    return {
+        "count": rows[0].total if rows else 0,
+        "page": page,
+        "per_page": per_page,
+        "data": [{
+            "id": row.id,
+            "name": row.name,
+            "num_upcoming_shows": row.num_upcoming_shows,
+            "version": row.version,
+        } for row in rows],
+    }
+
+
+def search_venues(term, page=1, per_page=PER_PAGE, criteria=()):
+    return _search(Venue, term, page, per_page, criteria)
+
+
+def search_artists(term, page=1, per_page=PER_PAGE, criteria=()):
+    return _search(Artist, term, page, per_page, criteria)
@@ -0,0 +1,73 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from flask import Blueprint, Response, current_app, render_template, request, flash, jsonify, abort, stream_with_context
+
+from model import db
+from queries import upcoming_shows, decode_cursor, SHOWS_PER_PAGE, MAX_SHOWS_PER_PAGE
+import scheduling
+from typeahead import index as typeahead_index
+
+bp = Blueprint('shows', __name__)
+
+#----------------------------------------------------------------------------#
+#  Show
+#----------------------------------------------------------------------------#
+
+@bp.route('/shows')
+def shows():
+  # displays list of shows at /shows
+  # TODO: replace with real venues data.
+  #       num_shows should be aggregated based on number of upcoming shows per venue.
+  per_page = min(request.args.get('per_page', SHOWS_PER_PAGE, type=int), MAX_SHOWS_PER_PAGE)
+  try:
+      after = decode_cursor(request.args['after']) if 'after' in request.args else None
+  except ValueError:
+      abort(400)
+  page = {"per_page": max(per_page, 1)}
+  data = upcoming_shows(page, after)
+  # stream the page so the first tiles go out while later rows are fetched
+  context = {"shows": data, "page": page}
+  current_app.update_template_context(context)
+  template = current_app.jinja_env.get_template('pages/shows.html')
+  return Response(stream_with_context(template.generate(context)))
+
+#----------------------------------------------------------------------------#
+#  Show Create
+#----------------------------------------------------------------------------#
+
+@bp.route('/typeahead/<any(venues, artists):kind>')
+def typeahead(kind):
+  # id/name suggestions for the venue and artist pickers of the show form
+  return jsonify(typeahead_index.lookup(kind, request.args.get('q', '')))
+
+@bp.route('/shows/create')
+def create_shows():
+  # renders form. do not touch.
+  from forms import ShowForm
+  form = ShowForm()
+  return render_template('forms/new_show.html', form=form)
+
+@bp.route('/shows/create', methods=['POST'])
+def create_show_submission():
+  # called to create new shows in the db, upon submitting new show listing form
+  # TODO: insert form data as a new Show record in the db, instead
+  try:
+      # a batch of one, so the form gets the same conflict checks as the API
+      result = scheduling.schedule([request.form.to_dict()])[0]
+      if result['status'] == 'created':
+          # on successful db insert, flash success
+          flash('Show was successfully listed!')
+      elif result['status'] == 'conflict':
+          flash('Show could not be listed, the %s is already booked at that time.'
+                % ' and '.join(conflict['on'] for conflict in result['conflicts']))
+      else:
+          flash('An error occurred. Show could not be listed.')
+  except:
+      db.session.rollback()
+      # TODO: on unsuccessful db insert, flash an error instead.
+      flash('An error occurred. Show could not be listed.')
+  finally:
+      db.session.close()
+  return render_template('pages/home.html')
@@ -2,3 +2,30 @@ window.parseISOString = function parseISOString(s) {
   var b = s.split(/\D+/);
   return new Date(Date.UTC(b[0], --b[1], b[2], b[3], b[4], b[5], b[6]));
 };
+// Show form pickers: fill the input's datalist with id/name suggestions
+// from the typeahead endpoint while the user types a name.
+document.querySelectorAll('input[data-typeahead]').forEach(function (input) {
+  var list = document.getElementById(input.getAttribute('list'));
+  var timer = null;
+  input.addEventListener('input', function () {
+    var query = input.value.trim();
+    clearTimeout(timer);
+    if (!query || /^\d+$/.test(query)) {
+      return;
+    }
+    timer = setTimeout(function () {
+      fetch(input.dataset.typeahead + '?q=' + encodeURIComponent(query))
+        .then(function (response) { return response.json(); })
+        .then(function (matches) {
+          list.innerHTML = '';
+          matches.forEach(function (match) {
+            var option = document.createElement('option');
+            option.value = match.id;
+            option.label = match.name;
+            option.textContent = match.name;
+            list.appendChild(option);
+          });
+        });
+    }, 150);
+  });
+});
@@ -0,0 +1,96 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from model import db, Venue, Artist
+import tiles
+
+#----------------------------------------------------------------------------#
+#  Fixtures
+#----------------------------------------------------------------------------#
+
+# The tests run against a scratch Postgres database named by
+# TEST_DATABASE_URL, its tables are dropped and created with create_all():
+#
+#   TEST_DATABASE_URL=postgresql://postgres@localhost:5432/fyyur_test python -m pytest tests
+
+@pytest.fixture(scope='session')
+def app():
+    url = os.environ.get('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('TEST_DATABASE_URL is not set')
+    # caches off so every request reads the database, jobs run inline
+    app = create_app(
+        SQLALCHEMY_DATABASE_URI=url, TESTING=True, JOBS_BACKEND='sync',
+        CACHE_BACKEND='memory', CACHE_SIZE=0, FRAGMENT_CACHE_SIZE=0,
+        SLOW_REQUEST_LOG=os.devnull, SERVER_TIMING=False,
+    )
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with app.app_context():
+        db.session.execute(db.text('TRUNCATE show_tile, show, venue, artist RESTART IDENTITY'))
+        db.session.commit()
+        db.session.remove()
+    return app.test_client()
+
+
+@contextmanager
+def statements(app):
+    # Collects the SQL statements run inside the block.
+    issued = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        issued.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield issued
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+#----------------------------------------------------------------------------#
+#  Rows
+#----------------------------------------------------------------------------#
+
+NEXT_WEEK = datetime.now().replace(microsecond=0) + timedelta(days=7)
+
+def add_venue(name, city='San Francisco', state='CA', **columns):
+    venue = Venue(name=name, city=city, state=state, genres=['Jazz'], **columns)
+    db.session.add(venue)
+    db.session.commit()
+    return venue.id
+
+
+def add_artist(name, city='San Francisco', state='CA', **columns):
+    artist = Artist(name=name, city=city, state=state, genres=['Jazz'], **columns)
+    db.session.add(artist)
+    db.session.commit()
+    return artist.id
+
+
+def add_show(venue_id, artist_id, start_time):
+    # with its tile, as a bulk load would
+    db.session.execute(
+        db.text('INSERT INTO show (venue, artist, start_time) VALUES (:venue, :artist, :start_time)'),
+        {'venue': venue_id, 'artist': artist_id, 'start_time': start_time})
+    tiles.add_missing()
+    db.session.commit()
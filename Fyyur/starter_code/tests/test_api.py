@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from conftest import add_venue, add_artist, add_show, NEXT_WEEK
+from model import db
+import queries
+
+
+def test_empty_show_batch_is_rejected(app, client):
+    response = client.post('/api/v1/shows', json={"shows": []})
+    assert response.status_code == 400
+
+
+def test_venue_etag_covers_only_the_rendered_shows(app, client, monkeypatch):
+    monkeypatch.setattr(queries, 'PAST_SHOWS_PER_PAGE', 2)
+    monkeypatch.setattr(queries, 'PAST_SHOWS_COUNT_LIMIT', 3)
+    with app.app_context():
+        venue_id = add_venue('Venue A')
+        artist_id = add_artist('Artist A')
+        for days in range(6):
+            add_show(venue_id, artist_id, NEXT_WEEK - timedelta(days=30 + days))
+    url = '/api/v1/venues/%d' % venue_id
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    # the oldest show is neither on the page nor in the capped count
+    with app.app_context():
+        db.session.execute(db.text(
+            "UPDATE show_tile SET artist_name = 'Renamed' WHERE show_id = 6"))
+        db.session.commit()
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    with app.app_context():
+        add_show(venue_id, artist_id, NEXT_WEEK)
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
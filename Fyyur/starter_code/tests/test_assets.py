@@ -0,0 +1,30 @@
+import os
+
+import assets
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as out:
+        out.write(content)
+
+
+def test_bundled_css_points_at_fingerprinted_fonts(tmp_path, monkeypatch):
+    static, out = str(tmp_path / 'static'), str(tmp_path / 'assets')
+    write(os.path.join(static, 'css', 'icons.css'),
+          '@font-face{src:url("../fonts/icons.woff") format("woff"),url(../fonts/icons.svg#icons),'
+          'url("../fonts/gone.ttf"),url(data:font/woff;base64,AAAA)}')
+    write(os.path.join(static, 'fonts', 'icons.woff'), 'woff')
+    write(os.path.join(static, 'fonts', 'icons.svg'), '<svg/>')
+    monkeypatch.setattr(assets, 'BUNDLES', {'main.css': ['css/icons.css']})
+    monkeypatch.setattr(assets, 'FILES', [])
+
+    manifest = assets.build(static, out)
+    with open(os.path.join(out, manifest['main.css'])) as bundle:
+        css = bundle.read()
+    # the bundle sits at the top of /assets, next to the fonts/ copies
+    assert 'url("%s")' % manifest['fonts/icons.woff'] in css
+    assert 'url(%s#icons)' % manifest['fonts/icons.svg'] in css
+    assert os.path.isfile(os.path.join(out, manifest['fonts/icons.woff']))
+    assert 'url("/static/fonts/gone.ttf")' in css
+    assert 'url(data:font/woff;base64,AAAA)' in css
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from app import create_app
+from conftest import add_venue
+
+pytest.importorskip('asyncpg')
+pytest.importorskip('asgiref')
+
+
+def async_app(url):
+    return create_app(SQLALCHEMY_DATABASE_URI=url, ASYNC_READS=True,
+                      ASYNC_DATABASE_URI=url.replace('postgresql://', 'postgresql+asyncpg://', 1),
+                      TESTING=True, CACHE_BACKEND='memory', CACHE_SIZE=0,
+                      FRAGMENT_CACHE_SIZE=0, SLOW_REQUEST_LOG=os.devnull)
+
+
+def test_each_app_reads_its_own_database(app, client):
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    first, second = async_app(url), async_app(url.rsplit('/', 1)[0] + '/elsewhere')
+    assert first.extensions['async_engine'].url.database == url.rsplit('/', 1)[1]
+    assert second.extensions['async_engine'].url.database == 'elsewhere'
+
+    with app.app_context():
+        venue_id = add_venue('Venue A')
+    response = first.test_client().get('/venues/%d' % venue_id)
+    assert b'Venue A' in response.data
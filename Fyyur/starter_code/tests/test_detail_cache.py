@@ -0,0 +1,42 @@
+import os
+import re
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app import create_app
+from conftest import add_venue, add_artist, add_show, NEXT_WEEK
+from model import db
+
+EDIT = {
+    'name': 'Venue A, renamed', 'genres': ['Jazz'], 'city': 'San Francisco', 'state': 'CA',
+    'address': '1 Main St', 'image_link': 'https://example.com/a.png',
+}
+
+
+def test_edit_evicts_every_cached_page(app, client):
+    # the shared app runs with the caches off, this one caches detail pages
+    cached = create_app(SQLALCHEMY_DATABASE_URI=app.config['SQLALCHEMY_DATABASE_URI'],
+                        TESTING=True, JOBS_BACKEND='sync', CACHE_BACKEND='memory',
+                        SLOW_REQUEST_LOG=os.devnull, SERVER_TIMING=False)
+    with app.app_context():
+        venue_id = add_venue('Venue A')
+        artist_id = add_artist('Artist A')
+        for days in range(12):
+            add_show(venue_id, artist_id, NEXT_WEEK - timedelta(days=30 + days))
+    issued = []
+    with cached.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: issued.append(args[2]))
+    browser = cached.test_client()
+
+    first = browser.get('/venues/%d' % venue_id).get_data(as_text=True)
+    older = '/venues/%d?past_before=%s' % (venue_id, re.search(r'past_before=([^"&]+)', first).group(1))
+    assert browser.get(older).status_code == 200
+    del issued[:]
+    assert browser.get('/venues/%d' % venue_id).get_data(as_text=True) == first
+    browser.get(older)
+    assert not issued
+
+    assert browser.post('/venues/%d/edit' % venue_id, data=EDIT).status_code == 302
+    assert b'Venue A, renamed' in browser.get('/venues/%d' % venue_id).get_data()
+    assert b'Venue A, renamed' in browser.get(older).get_data()
@@ -0,0 +1,20 @@
+import pytest
+
+from conftest import add_venue
+from exporter import export
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def test_parquet_column_null_in_first_batch(app, client, tmp_path):
+    with app.app_context():
+        add_venue('Venue A')
+        add_venue('Venue B', image_link='https://example.com/b.png', seeking_description='Jazz trios')
+        path = str(tmp_path / 'venues.parquet')
+        # one row per batch, the first one has no image_link
+        report = export('venues', path, format='parquet', batch_size=1)
+    assert report['rows'] == 2
+    table = pq.read_table(path)
+    assert str(table.schema.field('image_link').type) == 'string'
+    assert table.column('image_link').to_pylist() == [None, 'https://example.com/b.png']
+    assert table.column('genres').to_pylist() == [['Jazz'], ['Jazz']]
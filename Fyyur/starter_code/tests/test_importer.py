@@ -0,0 +1,21 @@
+import json
+
+from conftest import add_venue, add_artist, NEXT_WEEK
+from model import db, Venue, Artist
+from importer import import_file
+
+
+def test_show_import_refreshes_counters(app, client, tmp_path):
+    with app.app_context():
+        venue_id = add_venue('Venue A')
+        artist_id = add_artist('Artist A')
+    path = tmp_path / 'shows.ndjson'
+    path.write_text('\n'.join(json.dumps({
+        'venue_id': venue_id, 'artist_id': artist_id,
+        'start_time': (NEXT_WEEK.replace(hour=hour)).strftime('%Y-%m-%d %H:%M:%S'),
+    }) for hour in (12, 18)))
+    with app.app_context():
+        report = import_file('shows', str(path))
+        assert report['loaded'] == 2
+        assert db.session.get(Venue, venue_id).upcoming_show_count == 2
+        assert db.session.get(Artist, artist_id).upcoming_show_count == 2
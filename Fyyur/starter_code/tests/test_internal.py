@@ -0,0 +1,18 @@
+def test_operator_routes_refuse_loopback_without_token(app, client):
+    # behind a local reverse proxy every request comes from 127.0.0.1
+    for path in ('/_internal/cache', '/export/venues.ndjson'):
+        assert client.get(path).status_code == 403
+
+
+def test_operator_routes_take_the_token(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'INTERNAL_TOKEN', 'secret')
+    assert client.get('/_internal/cache').status_code == 403
+    response = client.get('/_internal/cache', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+
+
+def test_loopback_trust_is_opt_in(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'INTERNAL_TRUST_LOOPBACK', True)
+    assert client.get('/_internal/cache').status_code == 200
+    remote = {'REMOTE_ADDR': '203.0.113.7'}
+    assert client.get('/_internal/cache', environ_base=remote).status_code == 403
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from conftest import add_venue, add_artist, add_show, NEXT_WEEK
+import queries
+
+
+def test_past_show_count_is_capped(app, client, monkeypatch):
+    monkeypatch.setattr(queries, 'PAST_SHOWS_COUNT_LIMIT', 3)
+    with app.app_context():
+        venue_id = add_venue('Venue A')
+        artist_id = add_artist('Artist A')
+        for days in range(5):
+            add_show(venue_id, artist_id, NEXT_WEEK - timedelta(days=30 + days))
+        data = queries.venue_detail(venue_id)
+    assert data['past_shows_count'] == 3
+    assert data['past_shows_count_capped']
+    assert len(data['past_shows']) == 5
+    assert b'3+ Past Shows' in client.get('/venues/%d' % venue_id).data
@@ -0,0 +1,26 @@
+import os
+
+from app import create_app
+from conftest import add_venue, add_artist, add_show, NEXT_WEEK
+
+
+def test_streamed_page_counts_its_queries(app, client):
+    with app.app_context():
+        add_show(add_venue('Venue A'), add_artist('Artist A'), NEXT_WEEK)
+    response = client.get('/shows')
+    assert b'Artist A' in response.get_data()
+    response.close()
+    stats = app.extensions['profiler'].stats()['shows.shows']
+    assert stats['queries'] >= 1
+
+
+def test_second_app_does_not_count_twice(app, client):
+    # another app in the same process keeps its listeners to its own engine
+    create_app(SQLALCHEMY_DATABASE_URI=app.config['SQLALCHEMY_DATABASE_URI'],
+               SLOW_REQUEST_LOG=os.devnull)
+    profiler = app.extensions['profiler']
+    before = profiler.stats().get('venues.venues', {'requests': 0, 'queries': 0})
+    client.get('/venues').close()
+    after = profiler.stats()['venues.venues']
+    assert after['requests'] == before['requests'] + 1
+    assert after['queries'] - before['queries'] == 2
@@ -0,0 +1,61 @@
+import os
+
+from sqlalchemy import event
+
+from app import create_app
+from conftest import add_venue
+import routing
+
+
+def replica_reads(app, index=0):
+    # Counts the statements run on the app's index-th replica.
+    issued = []
+    event.listen(app.extensions['replicas'].engines[index], 'before_cursor_execute',
+                 lambda *args: issued.append(args[2]))
+    return issued
+
+
+def replicated_app(app, replicas=1):
+    # the test database stands in for replicas of itself
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    return create_app(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_REPLICA_URIS=[url] * replicas,
+                      TESTING=True, CACHE_BACKEND='memory', CACHE_SIZE=0,
+                      FRAGMENT_CACHE_SIZE=0, SLOW_REQUEST_LOG=os.devnull)
+
+
+def test_write_pins_client_to_primary(app, client):
+    replicated = replicated_app(app)
+    with app.app_context():
+        venue_id = add_venue('Venue A')
+    issued = replica_reads(replicated)
+
+    replicated.test_client().get('/venues/%d' % venue_id).close()
+    assert issued
+
+    writer = replicated.test_client()
+    response = writer.post('/venues/%d/edit' % venue_id, data={
+        'name': 'Venue A, renamed', 'genres': ['Jazz'], 'city': 'San Francisco', 'state': 'CA',
+        'address': '1 Main St', 'image_link': 'https://example.com/a.png',
+    })
+    assert response.status_code == 302
+    assert routing.PIN_COOKIE + '=' in response.headers['Set-Cookie']
+
+    del issued[:]
+    response = writer.get('/venues/%d' % venue_id)
+    assert b'Venue A, renamed' in response.get_data()
+    response.close()
+    assert not issued
+
+
+def test_request_reads_one_replica(app, client):
+    replicated = replicated_app(app, replicas=2)
+    with app.app_context():
+        venue_id = add_venue('Venue A')
+    first, second = replica_reads(replicated, 0), replica_reads(replicated, 1)
+    browser = replicated.test_client()
+    for _ in range(2):
+        del first[:], second[:]
+        browser.get('/venues/%d' % venue_id).close()
+        # the detail page runs several statements, all on the same replica
+        assert len(first + second) > 1
+        assert not (first and second)
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+from conftest import add_venue, add_artist, add_show, NEXT_WEEK
+from model import db
+import tiles
+
+# show_tile as it should be: every show joined with its venue and artist
+EXPECTED = tiles.TILES + "ORDER BY s.id"
+STORED = "SELECT " + tiles.COLUMNS + " FROM show_tile ORDER BY show_id"
+
+LAST_WEEK = NEXT_WEEK - timedelta(days=14)
+
+
+def assert_tiles_in_step(app):
+    with app.app_context():
+        expected = [tuple(row) for row in db.session.execute(db.text(EXPECTED))]
+        stored = [tuple(row) for row in db.session.execute(db.text(STORED))]
+        db.session.remove()
+    assert stored == expected
+    return stored
+
+
+def two_venues_two_artists(app):
+    with app.app_context():
+        venues = [add_venue('Venue A'), add_venue('Venue B')]
+        artists = [add_artist('Artist A'), add_artist('Artist B')]
+        add_show(venues[0], artists[0], LAST_WEEK)
+        add_show(venues[0], artists[1], NEXT_WEEK)
+        add_show(venues[1], artists[0], NEXT_WEEK + timedelta(days=1))
+    return venues, artists
+
+
+def test_edit_venue_updates_its_tiles(app, client):
+    venues, artists = two_venues_two_artists(app)
+    response = client.post('/venues/%d/edit' % venues[0], data={
+        'name': 'Venue A, renamed', 'genres': ['Jazz'], 'city': 'San Francisco', 'state': 'CA',
+        'address': '1 Main St', 'image_link': 'https://example.com/a.png',
+    })
+    assert response.status_code == 302
+    stored = assert_tiles_in_step(app)
+    assert sum(1 for tile in stored if tile[3] == 'Venue A, renamed') == 2
+
+
+def test_edit_artist_updates_its_tiles(app, client):
+    venues, artists = two_venues_two_artists(app)
+    response = client.post('/artists/%d/edit' % artists[0], data={
+        'name': 'Artist A, renamed', 'genres': ['Jazz'], 'city': 'San Francisco', 'state': 'CA',
+        'image_link': 'https://example.com/b.png',
+    })
+    assert response.status_code == 302
+    stored = assert_tiles_in_step(app)
+    assert sum(1 for tile in stored if tile[6] == 'Artist A, renamed') == 2
+
+
+def test_delete_venue_removes_its_tiles(app, client):
+    venues, artists = two_venues_two_artists(app)
+    response = client.post('/venues/%d' % venues[0])
+    assert response.status_code == 200
+    stored = assert_tiles_in_step(app)
+    assert [tile[2] for tile in stored] == [venues[1]]
+
+
+def test_delete_artist_removes_its_tiles(app, client):
+    venues, artists = two_venues_two_artists(app)
+    response = client.post('/artists/%d' % artists[0])
+    assert response.status_code == 200
+    assert b'was successfully deleted!' in response.data
+    stored = assert_tiles_in_step(app)
+    assert [tile[5] for tile in stored] == [artists[1]]
+
+
+def test_create_show_adds_its_tile(app, client):
+    venues, artists = two_venues_two_artists(app)
+    response = client.post('/shows/create', data={
+        'venue_id': venues[1], 'artist_id': artists[1],
+        'start_time': (NEXT_WEEK + timedelta(days=2)).isoformat(),
+    })
+    assert response.status_code == 200
+    assert b'Show was successfully listed!' in response.data
+    stored = assert_tiles_in_step(app)
+    assert len(stored) == 4
@@ -0,0 +1,28 @@
+from conftest import statements, add_venue
+
+CITIES = [('San Francisco', 'CA'), ('New York', 'NY'), ('Oakland', 'CA')]
+
+
+def venues_statements(app, client):
+    with statements(app) as issued:
+        response = client.get('/venues')
+    assert response.status_code == 200
+    return response, len(issued)
+
+
+def test_venues_query_count_does_not_grow_with_venues(app, client):
+    # /venues is built from one grouped query, however many venues and
+    # areas there are
+    with app.app_context():
+        add_venue('Venue 0')
+    response, few = venues_statements(app, client)
+    assert b'Venue 0' in response.data
+
+    with app.app_context():
+        for number in range(1, 40):
+            city, state = CITIES[number % len(CITIES)]
+            add_venue('Venue %d' % number, city=city, state=state)
+    response, many = venues_statements(app, client)
+    assert b'Venue 39' in response.data
+    assert b'New York' in response.data
+    assert many == few
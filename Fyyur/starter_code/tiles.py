@@ -0,0 +1,120 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from model import db
+
+#----------------------------------------------------------------------------#
+#  Show tile read model
+#----------------------------------------------------------------------------#
+
+# show_tile (model.ShowTile) copies each show's venue and artist names and
+# images. Every write path that changes what a tile shows calls one of the
+# hooks below before it commits, so the tiles change in the same
+# transaction as the rows they are built from:
+#
+#   shows_added(ids)        scheduling.schedule()
+#   venue_changed(id)       venue edit        artist_changed(id)   artist edit
+#   venue_deleted(id)       venue delete      artist_deleted(id)   artist delete
+#   shows_archived(lower, upper)              partitions.archive_partitions()
+#
+# Bulk loads (importer.py, benchmarks.seed) call add_missing(), and
+# `flask sync-show-tiles` runs sync() to repair whatever else wrote to the
+# tables directly.
+
+COLUMNS = """show_id, start_time, venue_id, venue_name, venue_image_link,
+             artist_id, artist_name, artist_image_link"""
+
+TILES = """
+SELECT s.id, s.start_time, v.id, v.name, v.image_link, a.id, a.name, a.image_link
+FROM show s
+JOIN venue v ON v.id = s.venue
+JOIN artist a ON a.id = s.artist
+"""
+
+# rewrites only the tiles that differ from their show
+UPSERT = """
+ON CONFLICT (show_id) DO UPDATE SET
+    start_time = excluded.start_time,
+    venue_id = excluded.venue_id,
+    venue_name = excluded.venue_name,
+    venue_image_link = excluded.venue_image_link,
+    artist_id = excluded.artist_id,
+    artist_name = excluded.artist_name,
+    artist_image_link = excluded.artist_image_link
+WHERE (show_tile.start_time, show_tile.venue_id, show_tile.venue_name,
+       show_tile.venue_image_link, show_tile.artist_id, show_tile.artist_name,
+       show_tile.artist_image_link)
+      IS DISTINCT FROM
+      (excluded.start_time, excluded.venue_id, excluded.venue_name,
+       excluded.venue_image_link, excluded.artist_id, excluded.artist_name,
+       excluded.artist_image_link)
+"""
+
+ADD = "INSERT INTO show_tile (" + COLUMNS + ")" + TILES + "WHERE s.id = ANY(:ids)" + UPSERT
+
+ADD_MISSING = ("INSERT INTO show_tile (" + COLUMNS + ")" + TILES +
+               "WHERE NOT EXISTS (SELECT 1 FROM show_tile t WHERE t.show_id = s.id)")
+
+SYNC = "INSERT INTO show_tile (" + COLUMNS + ")" + TILES + UPSERT
+
+REMOVE_ORPHANS = """
+DELETE FROM show_tile t WHERE NOT EXISTS (SELECT 1 FROM show s WHERE s.id = t.show_id)
+"""
+
+CHANGED = """
+UPDATE show_tile t SET {kind}_name = r.name, {kind}_image_link = r.image_link
+FROM {kind} r
+WHERE r.id = :id AND t.{kind}_id = r.id
+  AND (t.{kind}_name, t.{kind}_image_link) IS DISTINCT FROM (r.name, r.image_link)
+"""
+
+DELETED = "DELETE FROM show_tile WHERE {kind}_id = :id"
+
+ARCHIVED = "DELETE FROM show_tile WHERE start_time >= :lower AND start_time < :upper"
+
+
+def _execute(sql, params=None):
+    # pending ORM changes first, the statements read the base tables
+    db.session.flush()
+    return db.session.execute(db.text(sql), params or {}).rowcount
+
+
+def shows_added(show_ids):
+    if show_ids:
+        _execute(ADD, {'ids': list(show_ids)})
+
+
+def venue_changed(venue_id):
+    _execute(CHANGED.format(kind='venue'), {'id': venue_id})
+
+
+def artist_changed(artist_id):
+    _execute(CHANGED.format(kind='artist'), {'id': artist_id})
+
+
+def venue_deleted(venue_id):
+    _execute(DELETED.format(kind='venue'), {'id': venue_id})
+
+
+def artist_deleted(artist_id):
+    _execute(DELETED.format(kind='artist'), {'id': artist_id})
+
+
+def shows_archived(lower, upper):
+    _execute(ARCHIVED, {'lower': lower, 'upper': upper})
+
+
+def add_missing():
+    # Tiles for shows that have none, after a bulk insert. Returns the
+    # number of tiles added. Does not commit.
+    return _execute(ADD_MISSING)
+
+
+def sync():
+    # Brings every tile in line with its show, venue and artist: drops tiles
+    # of deleted shows, adds missing ones and rewrites stale ones. Returns
+    # the number of tiles changed and commits.
+    changed = _execute(REMOVE_ORPHANS) + _execute(SYNC)
+    db.session.commit()
+    return changed
@@ -0,0 +1,79 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+import threading
+import time
+from bisect import bisect_left
+
+from model import db, Venue, Artist
+
+MODELS = {
+    'venues': Venue,
+    'artists': Artist,
+}
+
+#----------------------------------------------------------------------------#
+#  Prefix index
+#----------------------------------------------------------------------------#
+
+class PrefixIndex(object):
+    # Sorted (key, id, name) entries per kind, searched with bisect. Every
+    # word of a name starts a key ("musical hop" for "The Musical Hop"), so
+    # typing any word of the name finds it. Built from one id/name query on
+    # first use and rebuilt lazily after invalidate(), which the
+    # create/edit/delete routes call. invalidate() only reaches the current
+    # process, so entries also expire after `max_age` seconds to pick up
+    # writes made by other workers and by `flask import`.
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, kind=None):
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(kind, None)
+
+    def _load(self, kind):
+        model = MODELS[kind]
+        rows = db.session.query(model.id, model.name).filter(model.name.isnot(None))
+        entries = []
+        for row in rows:
+            words = row.name.lower().split()
+            for start in range(len(words)):
+                entries.append((' '.join(words[start:]), row.id, row.name))
+        entries.sort()
+        return entries
+
+    def entries(self, kind):
+        loaded = self._entries.get(kind)
+        if loaded is not None and time.monotonic() - loaded[0] < self.max_age:
+            return loaded[1]
+        entries = self._load(kind)
+        with self._lock:
+            self._entries[kind] = (time.monotonic(), entries)
+        return entries
+
+    def lookup(self, kind, prefix, limit=10):
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        entries = self.entries(kind)
+        prefix = ' '.join(prefix.split())
+        matches = []
+        seen = set()
+        for position in range(bisect_left(entries, (prefix,)), len(entries)):
+            key, id, name = entries[position]
+            if not key.startswith(prefix) or len(matches) == limit:
+                break
+            if id not in seen:
+                seen.add(id)
+                matches.append({"id": id, "name": name})
+        return matches
+
+
+index = PrefixIndex()
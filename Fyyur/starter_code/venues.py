@@ -0,0 +1,198 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from flask import Blueprint, render_template, request, flash, redirect, url_for, abort
+from markupsafe import Markup
+
+from model import db, Venue
+from queries import venue_areas, venue_detail, related_artist_ids, past_cursor
+import search
+from facets import parse_filters, filter_criteria, cached_facet_counts, facet_links
+from cache import cache, venue_key, artist_key
+import counters
+import tiles
+import jobs
+from typeahead import index as typeahead_index
+
+bp = Blueprint('venues', __name__)
+
+#----------------------------------------------------------------------------#
+#  Venues
+#----------------------------------------------------------------------------#
+
+@bp.route('/venues')
+def venues():
+  # TODO: replace with real venues data.
+  #       num_shows should be aggregated based on number of upcoming shows per venue.
+  # ?genre=Jazz&genre=Blues&state=CA&city=... narrow the list down
+  filters = parse_filters(request.args)
+  data = venue_areas(filter_criteria(Venue, filters))
+  facets = facet_links(cached_facet_counts(Venue, filters), filters)
+  return render_template('pages/venues.html', areas=data, facets=facets, facet_endpoint='venues.venues');
+
+#----------------------------------------------------------------------------#
+#  Venues search
+#----------------------------------------------------------------------------#
+
+@bp.route('/venues/search', methods=['GET', 'POST'])
+def search_venues():
+  # TODO: implement search on artists with partial string search. Ensure it is case-insensitive.
+  # seach for Hop should return "The Musical Hop".
+  # search for "Music" should return "The Musical Hop" and "Park Square Live Music & Coffee"
+  # the facet links come back here with GET, the filters ride along
+  search_term = request.values.get('search_term', '')
+  page = request.values.get('page', 1, type=int)
+  filters = parse_filters(request.values)
+  response = search.search_venues(search_term, page, criteria=filter_criteria(Venue, filters))
+  counts = cached_facet_counts(Venue, filters, [search.match(Venue, search_term)], search_term)
+  facets = facet_links(counts, filters, search_term=search_term)
+  return render_template('pages/search_venues.html', results=response, search_term=search_term,
+                         filters=filters, facets=facets, facet_endpoint='venues.search_venues')
+
+#----------------------------------------------------------------------------#
+#  Venues id show
+#----------------------------------------------------------------------------#
+
+@bp.route('/venues/<int:venue_id>')
+def show_venue(venue_id):
+  # shows the venue page with the given venue_id
+  # TODO: replace with real venue data from the venues table, using venue_id
+  # ?past_before=<cursor> pages through the older past shows. Each page's
+  # rendered body is cached as a part of venue_key(), evicted with it.
+  try:
+    past_before = past_cursor(request.args)
+  except ValueError:
+    abort(400)
+  page = request.args.get('past_before', '')
+  part = cache.get_part(venue_key(venue_id), page)
+  if part is None:
+    data = venue_detail(venue_id, past_before)
+    if data is None:
+      abort(404)
+    part = {"name": data['name'], "body": render_template('pages/show_venue_body.html', venue=data)}
+    cache.set_part(venue_key(venue_id), page, part)
+  return render_template('pages/show_venue.html', venue=part, body=Markup(part['body']))
+
+#----------------------------------------------------------------------------#
+#  Create Venue
+#----------------------------------------------------------------------------#
+
+@bp.route('/venues/create', methods=['GET'])
+def create_venue_form():
+  from forms import VenueForm
+  form = VenueForm()
+  return render_template('forms/new_venue.html', form=form)
+
+@bp.route('/venues/create', methods=['POST'])
+def create_venue_submission():
+  # TODO: insert form data as a new Venue record in the db, instead
+  # TODO: modify data to be the data object returned from db insertion
+  try:
+      venue = Venue(name = request.form.get('name'),
+      address = request.form.get('address'),
+      city = request.form.get('city'),
+      state = request.form.get('state'),
+      phone = request.form.get('phone'),
+      genres = request.form.getlist('genres'),
+      website_link = request.form.get('website_link'),
+      facebook_link = request.form.get('facebook_link'),
+      seeking_talent = True if 'seeking_talent' in request.form else False,
+      image_link = request.form.get('image_link'),
+      seeking_description = request.form.get('seeking_description'))
+      db.session.add(venue)
+      jobs.after_commit(typeahead_index.invalidate, 'venues')
+      db.session.commit()
+      db.session.close()
+      # on successful db insert, flash success
+      flash('Venue ' + request.form['name'] + ' was successfully listed!')
+  except:
+      db.session.rollback()
+       # TODO: on unsuccessful db insert, flash an error instead.
+      flash('An error occurred. Venue ' + request.form['name'] + ' could not be listed.')
+  finally:
+      db.session.close()
+  return render_template('pages/home.html')
+
+#----------------------------------------------------------------------------#
+#  Venues Dalete
+#----------------------------------------------------------------------------#
+
+@bp.route('/venues/<venue_id>', methods=['POST'])
+def delete_venue(venue_id):
+  venue = Venue.query.filter_by(id=venue_id)
+  name = venue.first().name
+  artist_ids = related_artist_ids(venue_id)
+  stale = [venue_key(venue_id)] + [artist_key(id) for id in artist_ids]
+  # TODO: Complete this endpoint for taking a venue_id, and using
+  # SQLAlchemy ORM to delete a record. Handle cases where the session commit could fail.
+  try:
+    venue.delete()
+    tiles.venue_deleted(venue_id)
+    jobs.after_commit(cache.delete, *stale)
+    jobs.after_commit(typeahead_index.invalidate, 'venues')
+    # the venue's shows went with it (ON DELETE CASCADE)
+    jobs.after_commit(counters.recount, artist_ids=artist_ids)
+    db.session.commit()
+    flash('Venue ' + name + ' was successfully deleted!')
+  except:
+    db.session.rollback()
+    flash('An error occurred. Venue ' + name + ' could not be deleted.')
+  finally:
+    db.session.close()
+  return render_template('pages/home.html')
+
+#----------------------------------------------------------------------------#
+#  Venue Update
+#----------------------------------------------------------------------------#
+
+@bp.route('/venues/<int:venue_id>/edit', methods=['GET'])
+def edit_venue(venue_id):
+  from forms import VenueForm
+  form = VenueForm()
+  # TODO: populate form with values from venue with ID <venue_id>
+  venue = Venue.query.get(venue_id)
+  data={
+    "id": venue.id,
+    "name": venue.name,
+    "genres": venue.genres,
+    "address": venue.address,
+    "city": venue.city,
+    "state": venue.state,
+    "phone": venue.phone,
+    "website": venue.website_link,
+    "facebook_link": venue.facebook_link,
+    "seeking_talent": venue.seeking_talent,
+    "seeking_description": venue.seeking_description,
+    "image_link": venue.image_link,
+  }
+  return render_template('forms/edit_venue.html', form=form, venue=data)
+
+@bp.route('/venues/<int:venue_id>/edit', methods=['POST'])
+def edit_venue_submission(venue_id):
+  # TODO: take values from the form submitted, and update existing
+  # venue record with ID <venue_id> using the new attributes
+  venue = Venue.query.get(venue_id)
+  venue.name = request.form.get('name')
+  venue.genres = request.form.getlist('genres')
+  venue.address = request.form.get('address')
+  venue.city = request.form.get('city')
+  venue.state = request.form.get('state')
+  venue.phone = request.form.get('phone')
+  venue.website_link = request.form.get('website')
+  venue.facebook_link = request.form.get('facebook_link')
+  venue.seeking_talent = True if 'seeking_venue' in request.form else False
+  venue.seeking_description = request.form.get('seeking_description')
+  venue.image_link = request.form.get('image_link')
+  tiles.venue_changed(venue_id)
+  jobs.after_commit(evict_related_artists, venue_id)
+  jobs.after_commit(typeahead_index.invalidate, 'venues')
+  db.session.commit()
+  # not left to the job, the redirect below reads it
+  cache.delete(venue_key(venue_id))
+
+  return redirect(url_for('venues.show_venue', venue_id=venue_id))
+
+def evict_related_artists(venue_id):
+  # post-commit job: drops the cached pages of the venue's artists
+  cache.delete(*[artist_key(id) for id in related_artist_ids(venue_id)])